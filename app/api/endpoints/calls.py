@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.services.call_events import CallEventService
+from typing import Dict, Any
+from app.db.database import get_read_db
+
+router = APIRouter()
+
+@router.get("/stats")
+async def get_call_stats(
+    since_hours: int = Query(24, ge=1, le=24 * 90),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Dial-to-answer latency and call throughput from recorded status callbacks
+    """
+    service = CallEventService(db)
+    return service.stats(since_hours)
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.db.models import Candidate
 from typing import Dict, Any, List
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter
 from datetime import datetime
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.config import settings
+from app.core.responses import fast_json_response
 
 router = APIRouter()
 
@@ -24,6 +26,8 @@ class CandidateResponse(BaseModel):
     class Config:
         from_attributes = True
 
+candidate_list_adapter = TypeAdapter(List[CandidateResponse])
+
 @router.post("/", response_model=CandidateResponse)
 async def create_candidate(
     candidate_data: CandidateCreate,
@@ -55,20 +59,23 @@ async def create_candidate(
 
 @router.get("/", response_model=List[CandidateResponse])
 async def list_candidates(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> List[CandidateResponse]:
     """
     List all candidates
     """
     candidates = db.query(Candidate).offset(skip).limit(limit).all()
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(request, candidate_list_adapter, candidates)
     return candidates
 
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get a specific candidate by ID
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from app.core.admission import lane_snapshot
+from app.services.model_router import model_router
+from typing import Dict, Any
+
+router = APIRouter()
+
+@router.get("/models")
+async def get_model_health() -> Dict[str, Any]:
+    """
+    Latency, error rate and demotion state of each Groq model, per task, in this worker
+    """
+    return model_router.snapshot()
+
+@router.get("/admission")
+async def get_admission_lanes() -> Dict[str, Any]:
+    """
+    Limits and active, waiting and rejected request counts of each admission lane in this worker
+    """
+    return lane_snapshot()
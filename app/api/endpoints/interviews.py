@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, Form, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Form, WebSocket, status
 from sqlalchemy.orm import Session
 from app.services.interview import InterviewService
+from app.services.archive import ArchiveService
+from app.services.call_events import call_event_queue, parse_twilio_timestamp
+from app.services.media_stream import StreamingInterviewSession, load_speech_backend
 from app.db.models import Interview, Candidate, Report, InterviewResponse
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db_for_interview
 import json
 from app.core.config import settings
+from app.core.idempotency import webhook_cache
+from starlette.websockets import WebSocketState
 from twilio.twiml.voice_response import VoiceResponse, Gather
 
 router = APIRouter()
@@ -59,9 +64,22 @@ async def start_interview(
 def safe_twiml_response(twiml: str):
     return Response(content=twiml, media_type="application/xml", status_code=status.HTTP_200_OK)
 
+def stream_twiml(interview_id: int) -> str:
+    stream_url = settings.PUBLIC_BASE_URL.replace("https://", "wss://").replace("http://", "ws://")
+    return f"""
+<Response>
+    <Connect>
+        <Stream url="{stream_url}/api/v1/interviews/{interview_id}/media-stream"/>
+    </Connect>
+    <Hangup/>
+</Response>
+"""
+
 @router.post("/{interview_id}/twiml")
 async def interview_twiml(interview_id: int, db: Session = Depends(get_db)):
     print(f"DEBUG: TwiML endpoint called for interview {interview_id}")
+    if settings.INTERVIEW_MODE == "stream" and settings.STREAM_SPEECH_BACKEND:
+        return safe_twiml_response(stream_twiml(interview_id))
     try:
         interview = db.query(Interview).filter(Interview.id == interview_id).first()
         if not interview:
@@ -76,12 +94,10 @@ async def interview_twiml(interview_id: int, db: Session = Depends(get_db)):
         candidate_name = candidate.name if candidate else "Candidate"
         job_role = interview.job_description[:60] + ("..." if len(interview.job_description) > 60 else "")
         
-        print(f"DEBUG: Generating questions for job: {job_role}")
-        from app.services.groq_service import GroqService
-        groq_service = GroqService()
-        questions = await groq_service.generate_interview_questions(interview.job_description)
+        print(f"DEBUG: Loading questions for job: {job_role}")
+        questions = await InterviewService(db).get_questions(interview)
         
-        print(f"DEBUG: Generated {len(questions)} questions")
+        print(f"DEBUG: Loaded {len(questions)} questions")
         
         twiml = f"""
 <Response>
@@ -111,10 +127,32 @@ async def process_response(
     interview_id: int,
     question_index: int,
     SpeechResult: str = Form(None),
+    CallSid: str = Form(None),
     db: Session = Depends(get_db)
+):
+    if not CallSid:
+        return await _process_response(interview_id, question_index, SpeechResult, None, db)
+
+    # Twilio retries slow webhooks; a retry waits for the original attempt and replays its TwiML
+    dedupe_key = (interview_id, question_index, CallSid)
+    cached = webhook_cache.get(dedupe_key)
+    if cached is None:
+        async with webhook_cache.lock(dedupe_key):
+            cached = webhook_cache.get(dedupe_key)
+            if cached is None:
+                return await _process_response(interview_id, question_index, SpeechResult, CallSid, db)
+
+    print(f"DEBUG: Replaying TwiML for retried webhook {dedupe_key}")
+    return safe_twiml_response(cached)
+
+async def _process_response(
+    interview_id: int,
+    question_index: int,
+    SpeechResult: Optional[str],
+    CallSid: Optional[str],
+    db: Session
 ):
     try:
-        from app.services.groq_service import GroqService
         interview = db.query(Interview).filter(Interview.id == interview_id).first()
         if not interview:
             # This case should ideally not be hit if the interview exists
@@ -123,8 +161,7 @@ async def process_response(
         if interview.status == "completed":
             return safe_twiml_response('<Response><Say voice="alice">Thank you, your interview is already complete.</Say><Hangup/></Response>')
 
-        groq_service = GroqService()
-        questions = await groq_service.generate_interview_questions(interview.job_description)
+        questions = await InterviewService(db).get_questions(interview)
         
         user_response = (SpeechResult or "").strip().lower()
         response = VoiceResponse()
@@ -146,13 +183,13 @@ async def process_response(
 
         # Case 2: Candidate provides a response (or times out)
         # We save the response, even if it's empty from a timeout
-        db.add(InterviewResponse(
-            interview_id=interview_id,
-            question_index=question_index,
-            question=questions[question_index]['question'],
-            response=SpeechResult or "" # Store original casing
-        ))
-        db.commit()
+        InterviewService(db).record_response(
+            interview_id,
+            question_index,
+            questions[question_index]['question'],
+            SpeechResult or "", # Store original casing
+            CallSid
+        )
         
         next_question_index = question_index + 1
 
@@ -180,6 +217,8 @@ async def process_response(
             response.say("Thank you for your time. Your interview is now complete. Have a great day!", voice='alice')
             response.hangup()
             
+        if CallSid:
+            webhook_cache.put((interview_id, question_index, CallSid), str(response))
         return safe_twiml_response(str(response))
 
     except Exception as e:
@@ -192,6 +231,27 @@ async def process_response(
 """
         return safe_twiml_response(fallback)
 
+@router.websocket("/{interview_id}/media-stream")
+async def interview_media_stream(
+    websocket: WebSocket,
+    interview_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Bidirectional Twilio Media Stream running the interview in-process
+    """
+    backend = load_speech_backend()
+    await websocket.accept()
+    if backend is None:
+        print("DEBUG: Media stream rejected, STREAM_SPEECH_BACKEND is not configured")
+        await websocket.close(code=1011)
+        return
+
+    session = StreamingInterviewSession(websocket, db, backend, interview_id)
+    await session.run()
+    if websocket.client_state == WebSocketState.CONNECTED:
+        await websocket.close()
+
 @router.post("/{interview_id}/complete")
 async def complete_interview(
     interview_id: int,
@@ -211,14 +271,25 @@ async def complete_interview(
 @router.get("/{interview_id}/status")
 async def get_interview_status(
     interview_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db_for_interview)
 ) -> Dict[str, Any]:
     """
     Get the current status of an interview
     """
     interview = db.query(Interview).filter(Interview.id == interview_id).first()
     if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+        # Archived interviews keep reporting their final status from cold storage
+        payload = ArchiveService(db).get_interview_payload(interview_id)
+        if payload is None:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        archived = payload["interview"]
+        return {
+            "interview_id": archived["id"],
+            "status": archived["status"],
+            "scheduled_at": archived["scheduled_at"],
+            "started_at": archived["started_at"],
+            "completed_at": archived["completed_at"]
+        }
     
     return {
         "interview_id": interview.id,
@@ -229,8 +300,25 @@ async def get_interview_status(
     }
 
 @router.post("/{interview_id}/status")
-async def interview_status(interview_id: int):
-    # Log or process the status callback here
+async def interview_status(
+    interview_id: int,
+    CallSid: str = Form(None),
+    CallStatus: str = Form(None),
+    CallDuration: Optional[int] = Form(None),
+    SequenceNumber: Optional[int] = Form(None),
+    Timestamp: str = Form(None)
+):
+    # Queue the callback; events are written to call_events in batches
+    if CallSid and CallStatus:
+        call_event_queue.enqueue({
+            "interview_id": interview_id,
+            "call_sid": CallSid,
+            "call_status": CallStatus,
+            "sequence_number": SequenceNumber,
+            "call_duration": CallDuration,
+            "event_at": parse_twilio_timestamp(Timestamp),
+            "received_at": datetime.utcnow()
+        })
     return {"message": "Status received"}
 
 @router.get("/test")
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlalchemy.orm import Session
-from app.db.models import Report, Interview
-from typing import Dict, Any, List
-from pydantic import BaseModel
+from app.db.models import Report, Interview, ArchivedInterview
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
 from sqlalchemy import func
 from collections import Counter
-from app.db.database import get_db
+from app.db.database import get_read_db, get_read_db_for_interview
+from app.core.config import settings
+from app.core.responses import fast_json_response, serialize
+from app.core.http_cache import conditional_response, report_etag
+from app.services.analytics import AnalyticsService
+from app.services.archive import ArchiveService
+from app.services.rescore import latest_report_ids
+from app.services.tags import TAG_KINDS, TagService
 
 router = APIRouter()
 
@@ -18,74 +25,188 @@ class ReportResponse(BaseModel):
     weaknesses: List[str]
     detailed_analysis: str
     recommendations: str
+    version: Optional[int] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+report_adapter = TypeAdapter(ReportResponse)
+report_list_adapter = TypeAdapter(List[ReportResponse])
+
 @router.get("/interview/{interview_id}", response_model=ReportResponse)
 async def get_interview_report(
+    request: Request,
     interview_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db_for_interview)
 ) -> Dict[str, Any]:
     """
     Get the report for a specific interview
     """
-    report = db.query(Report).filter(Report.interview_id == interview_id).first()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-    
-    return report
+    # Reports are immutable and re-scoring appends a new row, so the newest
+    # (id, created_at) is enough to validate a cached copy
+    version = db.query(Report.id, Report.created_at).filter(
+        Report.interview_id == interview_id
+    ).order_by(Report.id.desc()).first()
+    if not version:
+        # Archived interviews keep serving their reports from cold storage; a
+        # live interview without a report has none yet, whatever the archive holds
+        if db.query(Interview.id).filter(Interview.id == interview_id).first():
+            raise HTTPException(status_code=404, detail="Report not found")
+        archived = ArchiveService(db).get_interview_reports(interview_id)
+        if not archived:
+            raise HTTPException(status_code=404, detail="Report not found")
+        current = archived[-1]
+        return conditional_response(
+            request,
+            report_etag("interview", [(current["id"], current["created_at"])]),
+            current["created_at"],
+            lambda: serialize(report_adapter, current),
+            f"private, max-age={settings.REPORT_CACHE_MAX_AGE}"
+        )
+
+    def render() -> bytes:
+        report = db.query(Report).filter(Report.id == version.id).first()
+        return serialize(report_adapter, report)
+
+    return conditional_response(
+        request,
+        report_etag("interview", [version]),
+        version.created_at,
+        render,
+        f"private, max-age={settings.REPORT_CACHE_MAX_AGE}"
+    )
 
 @router.get("/", response_model=List[ReportResponse])
 async def list_reports(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> List[ReportResponse]:
     """
     List all reports
     """
-    reports = db.query(Report).offset(skip).limit(limit).all()
+    current = Report.id.in_(latest_report_ids())
+    reports = db.query(Report).filter(current).order_by(Report.id).offset(skip).limit(limit).all()
+    if len(reports) < limit:
+        # Archived reports follow the live ones
+        live_total = db.query(func.count(Report.id)).filter(current).scalar() or 0
+        reports += ArchiveService(db).list_reports(max(0, skip - live_total), limit - len(reports))
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(request, report_list_adapter, reports)
     return reports
 
 @router.get("/candidate/{candidate_id}", response_model=List[ReportResponse])
 async def get_candidate_reports(
+    request: Request,
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> List[ReportResponse]:
     """
     Get all reports for a specific candidate
     """
     # Get all interviews for the candidate
-    interviews = db.query(Interview).filter(Interview.candidate_id == candidate_id).all()
+    interviews = db.query(Interview.id).filter(Interview.candidate_id == candidate_id).all()
     interview_ids = [interview.id for interview in interviews]
     
-    # Get all reports for these interviews
-    reports = db.query(Report).filter(Report.interview_id.in_(interview_ids)).all()
-    return reports
+    # The set of (id, created_at) pairs changes only when a new report is written
+    versions = db.query(Report.id, Report.created_at).filter(
+        Report.interview_id.in_(interview_ids),
+        Report.id.in_(latest_report_ids())
+    ).order_by(Report.id).all()
+    # Archive rows are immutable too, so their (interview_id, archived_at) pairs
+    # validate the archived part without decompressing anything
+    archived_versions = db.query(ArchivedInterview.interview_id, ArchivedInterview.archived_at).filter(
+        ArchivedInterview.candidate_id == candidate_id,
+        ArchivedInterview.report_count > 0
+    ).order_by(ArchivedInterview.interview_id).all()
+    last_modified = max(
+        (v[1] for v in list(versions) + list(archived_versions) if v[1]),
+        default=None
+    )
+
+    def render() -> bytes:
+        # Get all reports for these interviews
+        reports = db.query(Report).filter(Report.id.in_([v.id for v in versions])).order_by(Report.id).all()
+        if archived_versions:
+            reports += ArchiveService(db).get_candidate_reports(candidate_id)
+            reports.sort(key=lambda r: r["id"] if isinstance(r, dict) else r.id)
+        return serialize(report_list_adapter, reports)
+
+    return conditional_response(
+        request,
+        report_etag(f"candidate:{candidate_id}", list(versions) + list(archived_versions)),
+        last_modified,
+        render,
+        "private, no-cache"
+    )
+
+@router.get("/tags")
+async def list_report_tags(
+    kind: Optional[str] = Query(None, pattern=f"^({'|'.join(TAG_KINDS)})$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+) -> List[Dict[str, Any]]:
+    """
+    Most common strength and weakness tags across current reports
+    """
+    return TagService(db).top_tags(kind=kind, skip=skip, limit=limit)
+
+@router.get("/by-tags", response_model=List[ReportResponse])
+async def get_reports_by_tags(
+    strength: List[str] = Query([]),
+    weakness: List[str] = Query([]),
+    match: str = Query("all", pattern="^(all|any)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+) -> List[ReportResponse]:
+    """
+    Reports flagged with the given strengths and weaknesses, e.g.
+    ?weakness=system design&weakness=testing for reports weak on both
+    """
+    if not strength and not weakness:
+        raise HTTPException(status_code=400, detail="Pass at least one strength or weakness")
+    
+    return TagService(db).filter_reports(strength, weakness, match_all=match == "all", skip=skip, limit=limit)
 
 @router.get("/summary")
 async def get_reports_summary(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
-    Get a summary of all reports
+    Get a summary of all reports, archived interviews included
     """
-    total_reports = db.query(Report).count()
+    # Superseded report versions are left out
+    current = Report.id.in_(latest_report_ids())
+    total_reports = db.query(Report).filter(current).count()
     total_interviews = db.query(Interview).count()
+    total_interviews += db.query(func.count(ArchivedInterview.interview_id)).scalar() or 0
     
-    # Calculate average score
-    avg_score = db.query(func.avg(Report.overall_score)).scalar() or 0
-    
-    # Get most common strengths and weaknesses
+    # Get most common strengths and weaknesses, and the scores to average
     all_strengths = []
     all_weaknesses = []
-    reports = db.query(Report).all()
+    scores = []
+    reports = db.query(Report).filter(current).all()
     
     for report in reports:
         all_strengths.extend(report.strengths)
         all_weaknesses.extend(report.weaknesses)
+        if report.overall_score is not None:
+            scores.append(report.overall_score)
+
+    # Archived reports only exist inside their compressed payloads
+    for report in ArchiveService(db).iter_current_reports():
+        total_reports += 1
+        all_strengths.extend(report.get("strengths") or [])
+        all_weaknesses.extend(report.get("weaknesses") or [])
+        if report.get("overall_score") is not None:
+            scores.append(report["overall_score"])
+
+    # Calculate average score
+    avg_score = sum(scores) / len(scores) if scores else 0
     
     common_strengths = Counter(all_strengths).most_common(5)
     common_weaknesses = Counter(all_weaknesses).most_common(5)
@@ -96,4 +217,42 @@ async def get_reports_summary(
         "average_score": round(avg_score, 2),
         "common_strengths": common_strengths,
         "common_weaknesses": common_weaknesses
-    } 
\ No newline at end of file
+    } 
+
+@router.get("/analytics")
+async def get_reports_analytics(
+    db: Session = Depends(get_read_db)
+) -> List[Dict[str, Any]]:
+    """
+    Score percentiles per job cohort
+    """
+    return AnalyticsService(db).overview()
+
+@router.get("/analytics/{job_id}")
+async def get_cohort_analytics(
+    job_id: int,
+    db: Session = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Percentiles, score distribution and answer metrics for one job cohort
+    """
+    summary = AnalyticsService(db).cohort_summary(job_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Job cohort not found")
+    
+    return summary
+
+@router.get("/analytics/{job_id}/ranking")
+async def get_cohort_ranking(
+    job_id: int,
+    k: int = Query(10, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+) -> List[Dict[str, Any]]:
+    """
+    Top-k candidates of a job cohort by report score
+    """
+    ranking = AnalyticsService(db).ranking(job_id, k)
+    if ranking is None:
+        raise HTTPException(status_code=404, detail="Job cohort not found")
+    
+    return ranking
\ No newline at end of file
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.services.search import SearchService, DOC_TYPES
+from typing import Dict, Any, Optional
+from app.db.database import get_read_db
+
+router = APIRouter()
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, max_length=256),
+    doc_type: Optional[str] = Query(None, pattern=f"^({'|'.join(DOC_TYPES)})$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Ranked full-text search over candidates, interview responses and reports
+    """
+    service = SearchService(db)
+    results = service.search(q, doc_type=doc_type, skip=skip, limit=limit)
+    
+    return {
+        "query": q,
+        "skip": skip,
+        "limit": limit,
+        "results": results
+    }
\ No newline at end of file
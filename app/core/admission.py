@@ -0,0 +1,152 @@
+from app.core.config import settings
+from typing import Dict, List, Optional, Pattern, Tuple
+import asyncio
+import json
+import re
+
+class Lane:
+    """
+    Concurrency limit with a bounded wait queue.
+    A request is rejected at once when the queue is full, or after
+    queue_timeout seconds if no slot frees up while it waits.
+    """
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent  # 0 means unlimited
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+
+    async def acquire(self) -> bool:
+        if self._semaphore is None:
+            self.active += 1
+            return True
+        if not self._semaphore.locked():
+            # A free slot is taken without suspending
+            await self._semaphore.acquire()
+            self.active += 1
+            return True
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected
+        }
+
+# Lanes of the running middleware, reported by the health endpoint
+active_lanes: Dict[str, Lane] = {}
+
+def lane_snapshot() -> Dict[str, Dict[str, int]]:
+    return {name: lane.snapshot() for name, lane in active_lanes.items()}
+
+def _route(method: str, path: str) -> Tuple[str, Pattern]:
+    return method, re.compile(f"^{re.escape(settings.API_V1_STR)}{path}/?$")
+
+# Live-call webhooks: a candidate is on the phone waiting for the reply
+CRITICAL_ROUTES = [
+    _route("POST", r"/interviews/\d+/twiml"),
+    _route("POST", r"/interviews/\d+/response/\d+"),
+    _route("POST", r"/interviews/\d+/status"),
+]
+
+# Dashboard listings and aggregates that scan many rows
+BULK_ROUTES = [
+    _route("GET", r"/reports"),
+    _route("GET", r"/reports/summary"),
+    _route("GET", r"/reports/tags"),
+    _route("GET", r"/reports/by-tags"),
+    _route("GET", r"/reports/analytics(/[^/]+(/ranking)?)?"),
+    _route("GET", r"/candidates"),
+    _route("GET", r"/search"),
+    _route("GET", r"/calls/stats"),
+]
+
+def classify(method: str, path: str) -> str:
+    for lane, routes in (("critical", CRITICAL_ROUTES), ("bulk", BULK_ROUTES)):
+        if any(method == m and pattern.match(path) for m, pattern in routes):
+            return lane
+    return "default"
+
+class AdmissionControlMiddleware:
+    """
+    Admits HTTP requests through per-priority lanes so a burst of dashboard
+    traffic cannot take the workers and DB connections the call webhooks need.
+    Requests over a lane's limits get a fast 429 with Retry-After.
+    """
+    def __init__(self, app, lanes: Optional[List[Lane]] = None):
+        self.app = app
+        self.lanes = {lane.name: lane for lane in (lanes or default_lanes())}
+        active_lanes.update(self.lanes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.lanes[classify(scope["method"], scope["path"])]
+        if not await lane.acquire():
+            await self._reject(lane, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+    @staticmethod
+    async def _reject(lane: Lane, send) -> None:
+        body = json.dumps({"detail": f"Server busy ({lane.name} requests), retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+def pool_lane_limits() -> Tuple[int, int]:
+    """
+    (default, bulk) concurrency that fits the DB pool once the connections
+    reserved for critical requests are set aside. Each admitted request can
+    hold a connection, so larger lane limits would only queue in the pool
+    where webhooks wait behind dashboard reads.
+    """
+    shared = max(2, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW - settings.ADMISSION_CRITICAL_RESERVED_CONNECTIONS)
+    bulk = min(settings.ADMISSION_BULK_CONCURRENCY or shared // 2, shared - 1)
+    default = shared - bulk
+    if settings.ADMISSION_DEFAULT_CONCURRENCY:
+        default = min(settings.ADMISSION_DEFAULT_CONCURRENCY, default)
+    return default, bulk
+
+def default_lanes() -> List[Lane]:
+    default_concurrency, bulk_concurrency = pool_lane_limits()
+    return [
+        Lane("critical", settings.ADMISSION_CRITICAL_CONCURRENCY, settings.ADMISSION_CRITICAL_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+        Lane("default", default_concurrency, settings.ADMISSION_DEFAULT_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+        Lane("bulk", bulk_concurrency, settings.ADMISSION_BULK_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+    ]
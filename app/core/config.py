@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List
+import json
 import os
 from dotenv import load_dotenv
 
@@ -17,6 +18,11 @@ class Settings(BaseSettings):
     
     # Groq Configuration
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    # A model whose average latency or error rate crosses these limits is demoted
+    # behind its fallbacks for GROQ_MODEL_DEMOTION_SECONDS
+    GROQ_SLOW_MODEL_SECONDS: float = float(os.getenv("GROQ_SLOW_MODEL_SECONDS", "8"))
+    GROQ_MAX_ERROR_RATE: float = float(os.getenv("GROQ_MAX_ERROR_RATE", "0.5"))
+    GROQ_MODEL_DEMOTION_SECONDS: float = float(os.getenv("GROQ_MODEL_DEMOTION_SECONDS", "60"))
     
     # Twilio Configuration
     TWILIO_ACCOUNT_SID: str = os.getenv("TWILIO_ACCOUNT_SID", "")
@@ -29,10 +35,80 @@ class Settings(BaseSettings):
     
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Optional read replica for dashboard reads; empty routes everything to DATABASE_URL
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+    # Connections per engine: pool_size kept open plus max_overflow opened under load
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Reads of an interview written within this window, or any read while the replica
+    # lags further behind, go to the primary
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
     
     # Public Base URL for webhooks
     PUBLIC_BASE_URL: str = os.getenv("PUBLIC_BASE_URL", "")
     
+    # Interview Call Flow
+    # "gather" runs one <Gather> webhook per question, "stream" runs the interview
+    # in-process over a Twilio Media Stream (requires STREAM_SPEECH_BACKEND)
+    INTERVIEW_MODE: str = os.getenv("INTERVIEW_MODE", "gather")
+    STREAM_SPEECH_BACKEND: str = os.getenv("STREAM_SPEECH_BACKEND", "")  # "package.module:ClassName"
+    STREAM_ENERGY_THRESHOLD: float = float(os.getenv("STREAM_ENERGY_THRESHOLD", "500"))
+    STREAM_END_OF_TURN_MS: int = int(os.getenv("STREAM_END_OF_TURN_MS", "800"))
+    STREAM_NO_SPEECH_TIMEOUT_MS: int = int(os.getenv("STREAM_NO_SPEECH_TIMEOUT_MS", "10000"))
+    
+    # Question Reuse
+    # Minimum Jaccard similarity for a new job description to reuse stored questions.
+    # Recurring company/product names are left out of the comparison, so reposted
+    # roles score close to 1.0 and 0.8 still rejects postings that differ in substance
+    JD_SIMILARITY_THRESHOLD: float = float(os.getenv("JD_SIMILARITY_THRESHOLD", "0.8"))
+    
+    # Webhook Idempotency
+    WEBHOOK_DEDUPE_TTL_SECONDS: int = int(os.getenv("WEBHOOK_DEDUPE_TTL_SECONDS", "300"))
+    WEBHOOK_DEDUPE_MAX_ENTRIES: int = int(os.getenv("WEBHOOK_DEDUPE_MAX_ENTRIES", "10000"))
+    
+    # Call Event Ingestion
+    CALL_EVENT_BATCH_SIZE: int = int(os.getenv("CALL_EVENT_BATCH_SIZE", "100"))
+    CALL_EVENT_FLUSH_SECONDS: float = float(os.getenv("CALL_EVENT_FLUSH_SECONDS", "2"))
+    CALL_EVENT_MAX_PENDING: int = int(os.getenv("CALL_EVENT_MAX_PENDING", "10000"))
+    
+    # Archival
+    # Completed interviews older than this many days are moved to archived_interviews
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+    
+    # Bulk Re-scoring
+    RESCORE_CONCURRENCY: int = int(os.getenv("RESCORE_CONCURRENCY", "4"))
+    RESCORE_REQUESTS_PER_MINUTE: int = int(os.getenv("RESCORE_REQUESTS_PER_MINUTE", "30"))
+    
+    # Response Serialization
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    
+    # Admission Control
+    # Per-lane concurrency and wait-queue limits; 0 concurrency means unlimited.
+    # Critical: live-call webhooks, bulk: dashboard listings and aggregates.
+    # Default and bulk share the DB pool minus the connections reserved for
+    # critical requests, and are capped to that share.
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_CRITICAL_CONCURRENCY: int = int(os.getenv("ADMISSION_CRITICAL_CONCURRENCY", "0"))
+    ADMISSION_CRITICAL_QUEUE: int = int(os.getenv("ADMISSION_CRITICAL_QUEUE", "0"))
+    ADMISSION_CRITICAL_RESERVED_CONNECTIONS: int = int(os.getenv("ADMISSION_CRITICAL_RESERVED_CONNECTIONS", "5"))
+    ADMISSION_DEFAULT_CONCURRENCY: int = int(os.getenv("ADMISSION_DEFAULT_CONCURRENCY", "0"))  # 0: the rest of the pool
+    ADMISSION_DEFAULT_QUEUE: int = int(os.getenv("ADMISSION_DEFAULT_QUEUE", "64"))
+    ADMISSION_BULK_CONCURRENCY: int = int(os.getenv("ADMISSION_BULK_CONCURRENCY", "4"))
+    ADMISSION_BULK_QUEUE: int = int(os.getenv("ADMISSION_BULK_QUEUE", "8"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+    
+    # Request Recording
+    # Appends live-call webhook requests (redacted) to a JSONL file for
+    # scripts/replay_requests.py
+    REQUEST_RECORDING_ENABLED: bool = os.getenv("REQUEST_RECORDING_ENABLED", "false").lower() == "true"
+    REQUEST_RECORDING_PATH: str = os.getenv("REQUEST_RECORDING_PATH", "recordings/webhooks.jsonl")
+    
+    # Report HTTP Caching
+    REPORT_CACHE_SIZE: int = int(os.getenv("REPORT_CACHE_SIZE", "512"))
+    REPORT_CACHE_MAX_AGE: int = int(os.getenv("REPORT_CACHE_MAX_AGE", "300"))
+    
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     
@@ -48,6 +124,34 @@ class Settings(BaseSettings):
         except (ValueError, TypeError):
             return 11520  # 8 days default
     
+    @property
+    def GROQ_MODEL_ROUTES(self) -> Dict[str, List[str]]:
+        """
+        Models per GroqService method, primary first then fallbacks.
+        GROQ_MODEL_ROUTES is a JSON object overriding any of the defaults, e.g.
+        {"analyze_response": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"]}
+        """
+        routes = {
+            "generate_interview_questions": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+            "analyze_response": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+            "generate_final_report": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+        }
+        try:
+            overrides = json.loads(os.getenv("GROQ_MODEL_ROUTES", "") or "{}")
+        except ValueError:
+            overrides = {}
+        if not isinstance(overrides, dict):
+            overrides = {}
+        for task, models in overrides.items():
+            if isinstance(models, str):
+                models = [models]
+            # Anything other than a model name or a list of them is ignored
+            if not isinstance(models, list) or not models or not all(isinstance(m, str) and m for m in models):
+                print(f"DEBUG: Ignoring invalid GROQ_MODEL_ROUTES entry for {task}: {models!r}")
+                continue
+            routes[task] = models
+        return routes
+    
     class Config:
         case_sensitive = True
 
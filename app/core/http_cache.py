@@ -0,0 +1,142 @@
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.responses import accepted_encodings, compress_body
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+import hashlib
+import threading
+
+class RenderedBodyCache:
+    """
+    Small thread-safe LRU cache of rendered response bodies keyed by ETag and encoding
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[Tuple[bytes, Optional[str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[str, Optional[str]], entry: Tuple[bytes, Optional[str]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+rendered_cache = RenderedBodyCache(settings.REPORT_CACHE_SIZE)
+
+def report_etag(scope: str, versions: Iterable[Tuple[int, datetime]]) -> str:
+    """
+    Strong ETag derived from (report id, created_at) pairs.
+    Reports never change once written, so the pairs fully identify the body;
+    the scope keeps a single report and a listing of it from sharing a tag.
+    """
+    digest = hashlib.sha1(f"{scope};".encode())
+    for report_id, created_at in versions:
+        digest.update(f"{report_id}:{created_at.isoformat() if created_at else ''};".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    ETag of one content coding of a body: gzip and br bytes differ from the
+    identity body, so each representation gets its own strong tag
+    """
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def _candidate_etags(etag: str, accept_encoding: str) -> List[str]:
+    # Representations this request could be served: any accepted coding or identity
+    accepted = accepted_encodings(accept_encoding)
+    return [etag] + [
+        encoded_etag(etag, encoding) for encoding in ("br", "gzip")
+        if encoding in accepted or "*" in accepted
+    ]
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+def matching_etag(request: Request, etags: List[str]) -> Optional[str]:
+    """
+    The first of etags listed in If-None-Match, if any
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    for etag in etags:
+        if "*" in tags or etag in tags or f"W/{etag}" in tags:
+            return etag
+    return None
+
+def is_not_modified(request: Request, etags: List[str], last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match, falling back to If-Modified-Since when it is absent
+    """
+    if request.headers.get("if-none-match") is not None:
+        return matching_etag(request, etags) is not None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified) <= since
+    return False
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime],
+    render: Callable[[], bytes],
+    cache_control: str
+) -> Response:
+    """
+    Return 304 when the client copy is current, otherwise the (cached) rendered JSON body.
+    etag identifies the content; the tag sent carries the content coding as well.
+    """
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    key = (etag, accept_encoding)
+    entry = rendered_cache.get(key)
+
+    # The coding a client's copy used is in its tag, so no body is rendered
+    # just to check it
+    candidates = _candidate_etags(etag, accept_encoding)
+    if is_not_modified(request, candidates, last_modified):
+        matched = matching_etag(request, candidates)
+        headers["ETag"] = matched or encoded_etag(etag, entry[1] if entry else None)
+        return Response(status_code=304, headers=headers)
+
+    if entry is None:
+        entry = compress_body(render(), accept_encoding)
+        rendered_cache.put(key, entry)
+
+    body, encoding = entry
+    headers["ETag"] = encoded_etag(etag, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,76 @@
+from app.core.config import settings
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+
+class WebhookDedupeCache:
+    """
+    Short-lived cache of rendered webhook responses keyed by request identity.
+    Twilio retries a webhook when the first attempt is slow; the retry waits on
+    the per-key lock held by the original request and then replays its TwiML.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        # key -> [lock, number of requests holding or awaiting it]
+        self._locks: Dict[Hashable, list] = {}
+
+    def _purge(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        now = time.monotonic()
+        self._purge(now)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def put(self, key: Hashable, body: str) -> None:
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl_seconds, body)
+        self._entries.move_to_end(key)
+        self._purge(now)
+
+    def lock(self, key: Hashable) -> "_KeyLock":
+        return _KeyLock(self, key)
+
+class _KeyLock:
+    """
+    Async context manager around a per-key lock that is dropped once nobody holds or awaits it
+    """
+    def __init__(self, cache: WebhookDedupeCache, key: Hashable):
+        self.cache = cache
+        self.key = key
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        entry = self.cache._locks.setdefault(self.key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        self._lock = entry[0]
+        try:
+            await self._lock.acquire()
+        except BaseException:
+            self._release_entry()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._lock.release()
+        self._release_entry()
+        return False
+
+    def _release_entry(self) -> None:
+        entry = self.cache._locks.get(self.key)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.cache._locks[self.key]
+
+webhook_cache = WebhookDedupeCache(settings.WEBHOOK_DEDUPE_TTL_SECONDS, settings.WEBHOOK_DEDUPE_MAX_ENTRIES)
@@ -0,0 +1,116 @@
+from app.core.admission import classify
+from app.core.config import settings
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+import json
+import os
+import re
+import threading
+import time
+
+# Twilio webhook fields written verbatim: call state and timing, never the caller.
+# Any field not listed here or in FREE_TEXT_FIELDS is written as "[redacted]".
+VERBATIM_FIELDS = {
+    "CallSid", "CallStatus", "CallDuration", "Duration", "Direction", "Timestamp",
+    "SequenceNumber", "CallbackSource", "ApiVersion", "AnsweredBy",
+    "Confidence", "Stability", "SpeechResultSource", "Language",
+    "ErrorCode", "SipResponseCode",
+}
+# Free-text fields transcribed from the caller's speech, scrubbed of contact details
+FREE_TEXT_FIELDS = {"SpeechResult", "UnstableSpeechResult"}
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+# Phone and card numbers, also when transcribed with spaces or dashes between digits
+NUMBER_PATTERN = re.compile(r"\+?\d(?:[\s().-]*\d){5,}")
+
+def redact_text(value: str) -> str:
+    value = EMAIL_PATTERN.sub("[email]", value)
+    return NUMBER_PATTERN.sub("[number]", value)
+
+def redact_form(form: List[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Form fields with everything but call state redacted and contact details scrubbed from free text
+    """
+    return {
+        key: value if key in VERBATIM_FIELDS else redact_text(value) if key in FREE_TEXT_FIELDS else "[redacted]"
+        for key, value in form
+    }
+
+class RequestRecorder:
+    """
+    Appends one JSON line per recorded request to a file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, entry: Dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+class RequestRecordingMiddleware:
+    """
+    Records the live-call webhooks (twiml, response, status) with their form
+    fields and timings so a slow call can be replayed and profiled offline with
+    scripts/replay_requests.py. Only enabled with REQUEST_RECORDING_ENABLED.
+    """
+    def __init__(self, app, recorder: Optional[RequestRecorder] = None):
+        self.app = app
+        self.recorder = recorder or RequestRecorder(settings.REQUEST_RECORDING_PATH)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or classify(scope["method"], scope["path"]) != "critical":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.time()
+        started = time.perf_counter()
+        timings = {"status": None, "first_byte": None}
+
+        # Webhook bodies are small; read them up front so fields the endpoint
+        # doesn't declare are recorded too, then hand the body on unchanged
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body_sent = False
+
+        async def recording_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": bytes(body), "more_body": False}
+            return await receive()
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                timings["status"] = message["status"]
+                timings["first_byte"] = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, recording_receive, recording_send)
+        finally:
+            finished = time.perf_counter()
+            content_type = dict(scope.get("headers") or []).get(b"content-type", b"")
+            form = parse_qsl(body.decode("latin-1"), keep_blank_values=True) if b"form-urlencoded" in content_type else []
+            try:
+                self.recorder.write({
+                    "ts": started_at,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "form": redact_form(form),
+                    "status": timings["status"],
+                    "ttfb_ms": round((timings["first_byte"] - started) * 1000, 2) if timings["first_byte"] else None,
+                    "duration_ms": round((finished - started) * 1000, 2)
+                })
+            except OSError as e:
+                print(f"Error recording request {scope['path']}: {e}")
@@ -1,17 +1,87 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.db.models import Base
+from typing import Dict
+import threading
+import time
 
 # Always use DATABASE_URL from settings (Supabase Postgres)
 DATABASE_URL = settings.DATABASE_URL
+DATABASE_REPLICA_URL = settings.DATABASE_REPLICA_URL
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+def _create_engine(url: str):
+    if "sqlite" in url:
+        return create_engine(url, connect_args={"check_same_thread": False})
+    # Admission control sizes its lanes from these limits
+    return create_engine(url, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only traffic goes to the replica when one is configured
+replica_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else engine
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+class ReplicaRouter:
+    """
+    Decides whether a read may be served by the replica.
+    Interviews written by this process within REPLICA_MAX_LAG_SECONDS are read
+    from the primary so a status check right after scheduling sees the new row,
+    and all reads fall back to the primary while the replica lags further behind.
+    """
+    LAG_CHECK_INTERVAL = 5.0
+
+    def __init__(self, max_lag_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self._recent_writes: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._lag_checked_at = 0.0
+        self._replica_lagging = False
+
+    def record_write(self, interview_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[interview_id] = now
+            if len(self._recent_writes) > 10000:
+                cutoff = now - self.max_lag_seconds
+                self._recent_writes = {k: t for k, t in self._recent_writes.items() if t > cutoff}
+
+    def recently_written(self, interview_id: int) -> bool:
+        with self._lock:
+            written_at = self._recent_writes.get(interview_id)
+        return written_at is not None and time.monotonic() - written_at < self.max_lag_seconds
+
+    def replica_lagging(self) -> bool:
+        if replica_engine is engine or replica_engine.dialect.name != "postgresql":
+            return False
+        now = time.monotonic()
+        if now - self._lag_checked_at >= self.LAG_CHECK_INTERVAL:
+            self._lag_checked_at = now
+            try:
+                with replica_engine.connect() as conn:
+                    lag = conn.execute(text(
+                        "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    )).scalar()
+                self._replica_lagging = float(lag or 0) > self.max_lag_seconds
+            except Exception as e:
+                print(f"DEBUG: Replica lag check failed, using primary: {e}")
+                self._replica_lagging = True
+        return self._replica_lagging
+
+replica_router = ReplicaRouter(settings.REPLICA_MAX_LAG_SECONDS)
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_interview_writes(session, flush_context):
+    if replica_engine is engine:
+        return
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        interview_id = getattr(obj, "interview_id", None)
+        if interview_id is None and obj.__class__.__name__ == "Interview":
+            interview_id = obj.id
+        if interview_id is not None:
+            replica_router.record_write(interview_id)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -19,5 +89,40 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """
+    Session for read-only endpoints: the replica unless it is lagging
+    """
+    db = SessionLocal() if replica_router.replica_lagging() else ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db_for_interview(interview_id: int):
+    """
+    Read session for an interview, pinned to the primary right after it was written
+    """
+    if replica_router.recently_written(interview_id) or replica_router.replica_lagging():
+        db = SessionLocal()
+    else:
+        db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def init_db():
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    from app.db.migrations import (
+        add_missing_columns, add_missing_foreign_keys, add_missing_indexes,
+        enable_sqlite_autoincrement, move_job_descriptions
+    )
+    from app.services.search import init_search_index
+    import app.services.tags  # noqa: F401  registers the report tagging listener
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    add_missing_foreign_keys(engine)
+    enable_sqlite_autoincrement(engine)
+    add_missing_indexes(engine)
+    move_job_descriptions(engine)
+    init_search_index(engine)
\ No newline at end of file
@@ -0,0 +1,207 @@
+from sqlalchemy import and_, bindparam, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateTable
+from app.db.models import ArchivedInterview, Base, Interview, Job, Report
+from app.services.jobs import job_content_hash
+from datetime import datetime
+import re
+
+def add_missing_columns(engine: Engine) -> None:
+    """
+    Add nullable columns declared on the models but missing from existing tables.
+    create_all only creates new tables, so databases created before a column was
+    introduced get it added here on startup.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                references = ""
+                if engine.dialect.name == "sqlite" and column.foreign_keys:
+                    # SQLite can't add constraints later, only inline with the column
+                    target = next(iter(column.foreign_keys)).column
+                    references = f" REFERENCES {target.table.name}({target.name})"
+                print(f"DEBUG: Adding column {table.name}.{column.name} ({column_type})")
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{references}'))
+
+def add_missing_foreign_keys(engine: Engine) -> None:
+    """
+    Add foreign keys declared on the models but missing from existing tables,
+    e.g. on columns added by add_missing_columns. SQLite gets them inline when
+    the column is added and can't add them afterwards, so it is skipped.
+    """
+    if engine.dialect.name == "sqlite":
+        return
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {
+            (tuple(fk["constrained_columns"]), fk["referred_table"])
+            for fk in inspector.get_foreign_keys(table.name)
+        }
+        for fk in table.foreign_key_constraints:
+            columns = tuple(fk.column_keys)
+            if (columns, fk.referred_table.name) in existing:
+                continue
+            name = fk.name or f"fk_{table.name}_{'_'.join(columns)}"
+            referred = ", ".join(element.column.name for element in fk.elements)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ADD CONSTRAINT {name} FOREIGN KEY ({', '.join(columns)}) "
+                        f"REFERENCES {fk.referred_table.name} ({referred})"
+                    ))
+                print(f"DEBUG: Added foreign key {name}")
+            except SQLAlchemyError as e:
+                raise RuntimeError(f"Could not add foreign key {name}: {e}") from e
+
+def enable_sqlite_autoincrement(engine: Engine) -> None:
+    """
+    Rebuild SQLite tables declared with sqlite_autoincrement but created without
+    it. Plain SQLite tables hand out max(id) + 1, so ids freed by archiving were
+    reused and collided with archived interviews and reports. The sequence is
+    started past the highest archived id as well. Indexes are recreated by
+    add_missing_indexes afterwards.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    from app.services.archive import decompress_payload
+
+    archived_max = None
+    for table in (Interview.__table__, Report.__table__):
+        with engine.begin() as conn:
+            sql = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": table.name}
+            ).scalar()
+            if sql is None or "AUTOINCREMENT" in sql.upper():
+                continue
+
+            if archived_max is None:
+                archived_max = {"interviews": 0, "reports": 0}
+                for codec, blob in conn.execute(select(ArchivedInterview.codec, ArchivedInterview.payload)):
+                    payload = decompress_payload(codec, blob)
+                    archived_max["interviews"] = max(archived_max["interviews"], payload["interview"]["id"])
+                    for report in payload["reports"]:
+                        archived_max["reports"] = max(archived_max["reports"], report["id"])
+
+            columns = ", ".join(column.name for column in table.columns)
+            rebuilt = f"{table.name}__rebuild"
+            ddl = str(CreateTable(table).compile(dialect=engine.dialect))
+            conn.execute(text(re.sub(rf"CREATE TABLE {table.name} ", f"CREATE TABLE {rebuilt} ", ddl, count=1)))
+            conn.execute(text(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table.name}"))
+            conn.execute(text(f"DROP TABLE {table.name}"))
+            conn.execute(text(f"ALTER TABLE {rebuilt} RENAME TO {table.name}"))
+
+            floor = max(conn.execute(text(f"SELECT max(id) FROM {table.name}")).scalar() or 0, archived_max[table.name])
+            conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"), {"name": table.name, "seq": floor})
+            print(f"DEBUG: Rebuilt {table.name} with AUTOINCREMENT, next id {floor + 1}")
+
+def add_missing_indexes(engine: Engine) -> None:
+    """
+    Create indexes declared on the models but missing from existing tables.
+    Rows that would violate a new unique index are removed first, keeping the
+    oldest row of each key. Any other failure stops startup.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                with engine.begin() as conn:
+                    if index.unique:
+                        remove_duplicates(conn, table, list(index.columns))
+                    index.create(conn)
+                print(f"DEBUG: Created index {index.name}")
+            except SQLAlchemyError as e:
+                raise RuntimeError(f"Could not create index {index.name}: {e}") from e
+
+def remove_duplicates(conn, table, columns) -> None:
+    """
+    Delete all but the lowest-id row of each duplicated key.
+    Rows with a NULL in the key never conflict and are left alone.
+    """
+    keep = select(func.min(table.c.id).label("id")).where(
+        and_(*[column.isnot(None) for column in columns])
+    ).group_by(*columns).subquery()
+    result = conn.execute(table.delete().where(
+        and_(*[column.isnot(None) for column in columns]),
+        table.c.id.notin_(select(keep.c.id))
+    ))
+    if result.rowcount:
+        print(f"DEBUG: Removed {result.rowcount} duplicate rows from {table.name} before indexing")
+
+def move_job_descriptions(engine: Engine, batch_size: int = 500) -> None:
+    """
+    Point interviews that still hold their own job_description at a shared
+    jobs row and clear the copy. The first stored question set of a role
+    becomes the job's; interviews keep their own sets so calls in progress
+    are not switched to different questions.
+    """
+    interviews = Interview.__table__
+    jobs = Job.__table__
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(interviews.c.id, interviews.c.job_description, interviews.c.questions).where(
+                    interviews.c.job_id.is_(None),
+                    interviews.c.job_description.isnot(None)
+                ).order_by(interviews.c.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            hashes = {row.id: job_content_hash(row.job_description) for row in rows}
+            existing = dict(conn.execute(
+                select(jobs.c.content_hash, jobs.c.id).where(jobs.c.content_hash.in_(set(hashes.values())))
+            ).all())
+            new_jobs = {}
+            for row in rows:
+                content_hash = hashes[row.id]
+                if content_hash in existing:
+                    continue
+                job = new_jobs.setdefault(content_hash, {
+                    "content_hash": content_hash,
+                    "description": row.job_description.strip(),
+                    "questions": None,
+                    "created_at": datetime.utcnow()
+                })
+                if job["questions"] is None and row.questions:
+                    job["questions"] = row.questions
+            if new_jobs:
+                conn.execute(jobs.insert(), list(new_jobs.values()))
+                existing.update(conn.execute(
+                    select(jobs.c.content_hash, jobs.c.id).where(jobs.c.content_hash.in_(list(new_jobs)))
+                ).all())
+
+            conn.execute(
+                interviews.update().where(interviews.c.id == bindparam("interview_id")).values(
+                    job_id=bindparam("new_job_id"),
+                    job_description=None
+                ),
+                [{"interview_id": row.id, "new_job_id": existing[hashes[row.id]]} for row in rows]
+            )
+            moved += len(rows)
+
+    if moved:
+        print(f"DEBUG: Moved job descriptions of {moved} interviews to jobs")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Float, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,12 +17,29 @@ class Candidate(Base):
     
     interviews = relationship("Interview", back_populates="candidate")
 
+class Job(Base):
+    __tablename__ = "jobs"
+
+    # One row per distinct job description, shared by every interview for the role
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True)  # sha256 of the whitespace/case-normalized description
+    description = Column(Text)
+    questions = Column(JSON, nullable=True)  # generated once per role, reused by all its interviews
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    interviews = relationship("Interview", back_populates="job")
+
 class Interview(Base):
     __tablename__ = "interviews"
+    # Archiving deletes rows; ids must never be handed out again on SQLite
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
-    job_description = Column(Text)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)
+    # Per-interview copy from before jobs existed; moved to jobs and cleared on startup
+    legacy_job_description = Column("job_description", Text, nullable=True)
+    questions = Column(JSON, nullable=True)  # sets generated before jobs existed; new ones are stored on the job
     status = Column(String)  # scheduled, in_progress, completed, cancelled
     scheduled_at = Column(DateTime)
     started_at = Column(DateTime, nullable=True)
@@ -30,10 +47,22 @@ class Interview(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     candidate = relationship("Candidate", back_populates="interviews")
+    job = relationship("Job", back_populates="interviews")
     report = relationship("Report", back_populates="interview", uselist=False)
 
+    @property
+    def job_description(self) -> str:
+        if self.job is not None:
+            return self.job.description
+        return self.legacy_job_description
+
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # Current-version lookups take max(id) per interview_id from this index
+        Index("ix_reports_interview_id_id", "interview_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
@@ -42,15 +71,68 @@ class Report(Base):
     weaknesses = Column(JSON)
     detailed_analysis = Column(Text)
     recommendations = Column(Text)
+    version = Column(Integer, nullable=True, default=1)  # bumped by re-scoring; NULL on rows older than versioning means 1
     created_at = Column(DateTime, default=datetime.utcnow)
     
     interview = relationship("Interview", back_populates="report")
 
 class InterviewResponse(Base):
     __tablename__ = "interview_responses"
+    __table_args__ = (
+        # One answer per question; retried Twilio webhooks must not add rows
+        Index("uq_interview_responses_question", "interview_id", "question_index", unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
     question_index = Column(Integer)
     question = Column(Text)
     response = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    call_sid = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow) 
+
+class CallEvent(Base):
+    __tablename__ = "call_events"
+    __table_args__ = (
+        Index("ix_call_events_call_sid_status", "call_sid", "call_status"),
+    )
+
+    # Append-only log of Twilio status callbacks
+    id = Column(Integer, primary_key=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), index=True)
+    call_sid = Column(String)
+    call_status = Column(String)  # queued, initiated, ringing, in-progress, completed, busy, failed, no-answer, canceled
+    sequence_number = Column(Integer, nullable=True)
+    call_duration = Column(Integer, nullable=True)  # seconds, sent with the completed callback
+    event_at = Column(DateTime, index=True)  # Twilio's Timestamp, or receipt time when absent
+    received_at = Column(DateTime, default=datetime.utcnow)
+
+class ArchivedInterview(Base):
+    __tablename__ = "archived_interviews"
+
+    # Cold storage for completed interviews: the interview row, its transcript,
+    # reports and call events serialized as one compressed JSON blob
+    interview_id = Column(Integer, primary_key=True, autoincrement=False)
+    candidate_id = Column(Integer, index=True)
+    completed_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    report_count = Column(Integer, default=0)  # lets report listings skip blobs without decoding them
+    codec = Column(String)  # zstd or zlib
+    payload = Column(LargeBinary)
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    # Interned strength/weakness labels, stored normalized (lowercase, single spaces)
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, index=True)
+
+class ReportTag(Base):
+    __tablename__ = "report_tags"
+    __table_args__ = (
+        # Tag filters look up reports by (tag, kind)
+        Index("ix_report_tags_tag_kind", "tag_id", "kind", "report_id"),
+    )
+
+    report_id = Column(Integer, ForeignKey("reports.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    kind = Column(String, primary_key=True)  # strength or weakness
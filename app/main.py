@@ -1,8 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.endpoints import candidates, interviews, reports
+from app.core.admission import AdmissionControlMiddleware
+from app.core.recording import RequestRecordingMiddleware
+from app.api.endpoints import calls, candidates, health, interviews, reports, search
 from app.db.database import init_db
+from app.core.responses import default_response_class
+from app.services.call_events import call_event_queue
 
 # Initialize the database
 init_db()
@@ -10,9 +14,19 @@ init_db()
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=default_response_class()
 )
 
+# Shed dashboard load before it reaches the call webhooks; added before CORS so
+# rejections still carry CORS headers
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
+# Record webhooks for offline replay, including time spent waiting for admission
+if settings.REQUEST_RECORDING_ENABLED:
+    app.add_middleware(RequestRecordingMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +55,32 @@ app.include_router(
     tags=["reports"]
 )
 
+app.include_router(
+    calls.router,
+    prefix=f"{settings.API_V1_STR}/calls",
+    tags=["calls"]
+)
+
+app.include_router(
+    search.router,
+    prefix=f"{settings.API_V1_STR}/search",
+    tags=["search"]
+)
+
+app.include_router(
+    health.router,
+    prefix=f"{settings.API_V1_STR}/health",
+    tags=["health"]
+)
+
+@app.on_event("startup")
+async def start_background_queues():
+    call_event_queue.start()
+
+@app.on_event("shutdown")
+async def flush_background_queues():
+    await call_event_queue.stop()
+
 @app.get("/")
 async def root():
     return {
@@ -0,0 +1,236 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.db.models import Interview, Job, Report, InterviewResponse
+from app.services.rescore import latest_report_ids
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import threading
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = np.arange(0, 101, 10)
+
+class ReportScores:
+    """
+    Columnar snapshot of report scores and per-answer metrics, one row per
+    interview's current report
+    """
+    def __init__(self, db: Session, batch_size: int = 5000):
+        report_ids, interview_ids, candidate_ids, scores, job_codes = [], [], [], [], []
+        self.job_ids: List[int] = []
+        codes: Dict[int, int] = {}
+
+        rows = db.query(
+            Report.id, Report.interview_id, Report.overall_score,
+            Interview.candidate_id, Interview.job_id
+        ).join(Interview, Report.interview_id == Interview.id).filter(
+            Report.id.in_(latest_report_ids())
+        ).order_by(Report.id).yield_per(batch_size)
+
+        for report_id, interview_id, score, candidate_id, job_id in rows:
+            key = job_id or 0  # 0 collects interviews without a job
+            if key not in codes:
+                codes[key] = len(self.job_ids)
+                self.job_ids.append(key)
+            report_ids.append(report_id)
+            interview_ids.append(interview_id)
+            candidate_ids.append(candidate_id if candidate_id is not None else -1)
+            scores.append(score or 0)
+            job_codes.append(codes[key])
+
+        self.report_ids = np.asarray(report_ids, dtype=np.int64)
+        self.interview_ids = np.asarray(interview_ids, dtype=np.int64)
+        self.candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.job_codes = np.asarray(job_codes, dtype=np.int64)
+        self.job_index = codes
+        self.job_titles = self._load_job_titles(db)
+
+        self._load_answer_metrics(db, batch_size)
+
+    def _load_job_titles(self, db: Session, length: int = 60) -> List[str]:
+        """
+        Shortened job descriptions per cohort; only a prefix of each description is read
+        """
+        prefixes = dict(db.query(Job.id, func.substr(Job.description, 1, length + 1)).filter(
+            Job.id.in_([job_id for job_id in self.job_ids if job_id])
+        ))
+        titles = []
+        for job_id in self.job_ids:
+            description = prefixes.get(job_id) or ""
+            titles.append(description[:length] + ("..." if len(description) > length else ""))
+        return titles
+
+    def _load_answer_metrics(self, db: Session, batch_size: int) -> None:
+        """
+        Per-report answered ratio and mean answer length, aggregated with bincount
+        """
+        answered = np.zeros(len(self.report_ids))
+        total = np.zeros(len(self.report_ids))
+        words = np.zeros(len(self.report_ids))
+        if len(self.report_ids):
+            # Map interview ids to report rows; re-scored interviews map to every row
+            order = np.argsort(self.interview_ids, kind="stable")
+            sorted_interviews = self.interview_ids[order]
+
+            query = db.query(InterviewResponse.interview_id, InterviewResponse.response).order_by(
+                InterviewResponse.id
+            ).yield_per(batch_size)
+            batch = []
+            for row in query:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._accumulate(batch, order, sorted_interviews, answered, total, words)
+                    batch = []
+            self._accumulate(batch, order, sorted_interviews, answered, total, words)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.answered_ratio = np.where(total > 0, answered / total, 0.0)
+            self.mean_answer_words = np.where(answered > 0, words / answered, 0.0)
+
+    @staticmethod
+    def _accumulate(batch, order, sorted_interviews, answered, total, words) -> None:
+        if not batch:
+            return
+        interview_ids = np.fromiter((r[0] for r in batch), dtype=np.int64, count=len(batch))
+        word_counts = np.fromiter((len((r[1] or "").split()) for r in batch), dtype=np.float64, count=len(batch))
+        left = np.searchsorted(sorted_interviews, interview_ids, side="left")
+        right = np.searchsorted(sorted_interviews, interview_ids, side="right")
+        for offset in range(int((right - left).max(initial=0))):
+            hit = left + offset < right
+            rows = order[left[hit] + offset]
+            np.add.at(total, rows, 1)
+            np.add.at(answered, rows, word_counts[hit] > 0)
+            np.add.at(words, rows, word_counts[hit])
+
+    def cohort(self, key: int) -> Optional[np.ndarray]:
+        """
+        Row indexes of the reports belonging to a job cohort
+        """
+        code = self.job_index.get(key)
+        if code is None:
+            return None
+        return np.flatnonzero(self.job_codes == code)
+
+class AnalyticsService:
+    """
+    Cohort percentiles, score distributions and rankings per job.
+    Results are cached until the reports table changes.
+    """
+    _lock = threading.Lock()
+    _snapshot_version: Optional[Tuple[int, int]] = None
+    _snapshot: Optional[ReportScores] = None
+    _results: Dict[Any, Any] = {}
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _data_version(self) -> Tuple[int, int]:
+        """
+        (max report id, report count), read from the database so reports written
+        or archived by other workers and scripts are noticed too. Reports are
+        never updated, only inserted or deleted, which always changes the pair.
+        """
+        max_id, count = self.db.query(func.max(Report.id), func.count(Report.id)).one()
+        return max_id or 0, count
+
+    def _cached(self, key, compute):
+        cls = AnalyticsService
+        version = self._data_version()
+        with cls._lock:
+            if cls._snapshot_version != version or cls._snapshot is None:
+                cls._snapshot = ReportScores(self.db)
+                cls._snapshot_version = version
+                cls._results = {}
+            if key not in cls._results:
+                cls._results[key] = compute(cls._snapshot)
+            return cls._results[key]
+
+    @staticmethod
+    def _stats(scores: np.ndarray) -> Dict[str, Any]:
+        if scores.size == 0:
+            return {"count": 0, "mean": 0.0, "percentiles": {f"p{p}": 0.0 for p in PERCENTILES}}
+        values = np.percentile(scores, PERCENTILES)
+        return {
+            "count": int(scores.size),
+            "mean": round(float(scores.mean()), 2),
+            "percentiles": {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, values)}
+        }
+
+    def overview(self) -> List[Dict[str, Any]]:
+        """
+        Score statistics for every job cohort, largest cohorts first
+        """
+        def compute(data: ReportScores) -> List[Dict[str, Any]]:
+            if not len(data.scores):
+                return []
+            # Sort once by (cohort, score) and slice cohorts out of the sorted array
+            order = np.lexsort((data.scores, data.job_codes))
+            codes = data.job_codes[order]
+            bounds = np.flatnonzero(np.diff(codes)) + 1
+            cohorts = []
+            for group in np.split(order, bounds):
+                code = int(data.job_codes[group[0]])
+                cohorts.append({
+                    "job_id": data.job_ids[code],
+                    "job_title": data.job_titles[code],
+                    **self._stats(data.scores[group]),
+                    "answered_ratio": round(float(data.answered_ratio[group].mean()), 3)
+                })
+            return sorted(cohorts, key=lambda c: c["count"], reverse=True)
+
+        return self._cached(("overview",), compute)
+
+    def cohort_summary(self, key: int) -> Optional[Dict[str, Any]]:
+        """
+        Percentiles, histogram and answer metrics for one job cohort
+        """
+        def compute(data: ReportScores) -> Optional[Dict[str, Any]]:
+            rows = data.cohort(key)
+            if rows is None:
+                return None
+            scores = data.scores[rows]
+            counts, edges = np.histogram(scores, bins=HISTOGRAM_BINS)
+            return {
+                "job_id": key,
+                "job_title": data.job_titles[data.job_index[key]],
+                **self._stats(scores),
+                "histogram": [
+                    {"min": int(low), "max": int(high), "count": int(count)}
+                    for low, high, count in zip(edges[:-1], edges[1:], counts)
+                ],
+                "answered_ratio": round(float(data.answered_ratio[rows].mean()), 3),
+                "mean_answer_words": round(float(data.mean_answer_words[rows].mean()), 1)
+            }
+
+        return self._cached(("cohort", key), compute)
+
+    def ranking(self, key: int, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Top-k reports of a job cohort by score, ties broken by answered ratio
+        """
+        def compute(data: ReportScores) -> Optional[List[Dict[str, Any]]]:
+            rows = data.cohort(key)
+            if rows is None:
+                return None
+            scores = data.scores[rows]
+            top = rows
+            if rows.size > k:
+                # Partial selection first, then sort only the k winners
+                top = rows[np.argpartition(-scores, k - 1)[:k]]
+            top = top[np.lexsort((-data.answered_ratio[top], -data.scores[top]))]
+            sorted_scores = np.sort(scores)
+            percentile = np.searchsorted(sorted_scores, data.scores[top], side="right") / sorted_scores.size * 100
+            return [
+                {
+                    "rank": position + 1,
+                    "report_id": int(data.report_ids[row]),
+                    "interview_id": int(data.interview_ids[row]),
+                    "candidate_id": int(data.candidate_ids[row]),
+                    "overall_score": float(data.scores[row]),
+                    "percentile": round(float(pct), 1),
+                    "answered_ratio": round(float(data.answered_ratio[row]), 3)
+                }
+                for position, (row, pct) in enumerate(zip(top, percentile))
+            ]
+
+        return self._cached(("ranking", key, k), compute)
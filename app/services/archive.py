@@ -0,0 +1,172 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.models import ArchivedInterview, CallEvent, Interview, InterviewResponse, Report
+from app.services.search import remove_documents
+from app.services.tags import untag_reports
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is used without it
+    zstandard = None
+
+def compress_payload(payload: Dict[str, Any]) -> Tuple[str, bytes]:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "zlib", zlib.compress(data, 9)
+
+def decompress_payload(codec: str, data: bytes) -> Dict[str, Any]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this archive")
+        return json.loads(zstandard.ZstdDecompressor().decompress(data))
+    return json.loads(zlib.decompress(data))
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    values = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.key)
+        values[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return values
+
+def _report_from_archive(values: Dict[str, Any]) -> Dict[str, Any]:
+    report = dict(values)
+    if report.get("created_at"):
+        report["created_at"] = datetime.fromisoformat(report["created_at"])
+    return report
+
+class ArchiveService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def archive_completed(self, older_than_days: int, batch_size: int = 100) -> Dict[str, int]:
+        """
+        Move completed interviews older than the cutoff, with their transcripts,
+        reports and call events, into compressed archive rows.
+        Archived transcripts and reports leave the search index, as they would
+        on a rebuild; reports stay readable through the report endpoints.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        counts = {"interviews": 0, "responses": 0, "reports": 0, "bytes": 0}
+
+        while True:
+            interviews = self.db.query(Interview).filter(
+                Interview.status == "completed",
+                Interview.completed_at < cutoff,
+                # An id SQLite reused before interviews had AUTOINCREMENT would
+                # collide with its archive row; such interviews stay live
+                Interview.id.notin_(select(ArchivedInterview.interview_id))
+            ).order_by(Interview.id).limit(batch_size).all()
+            if not interviews:
+                break
+
+            ids = [interview.id for interview in interviews]
+            responses = self._group(InterviewResponse, ids)
+            reports = self._group(Report, ids)
+            events = self._group(CallEvent, ids)
+
+            try:
+                for interview in interviews:
+                    codec, blob = compress_payload({
+                        "interview": {**_row_to_dict(interview), "job_description": interview.job_description},
+                        "responses": [_row_to_dict(r) for r in responses.get(interview.id, [])],
+                        "reports": [_row_to_dict(r) for r in reports.get(interview.id, [])],
+                        "call_events": [_row_to_dict(e) for e in events.get(interview.id, [])]
+                    })
+                    self.db.add(ArchivedInterview(
+                        interview_id=interview.id,
+                        candidate_id=interview.candidate_id,
+                        completed_at=interview.completed_at,
+                        report_count=min(len(reports.get(interview.id, [])), 1),  # listings show the current version only
+                        codec=codec,
+                        payload=blob
+                    ))
+                    counts["interviews"] += 1
+                    counts["responses"] += len(responses.get(interview.id, []))
+                    counts["reports"] += len(reports.get(interview.id, []))
+                    counts["bytes"] += len(blob)
+
+                report_ids = [r.id for rows in reports.values() for r in rows]
+                untag_reports(self.db.connection(), report_ids)
+                remove_documents(self.db.connection(), "report", report_ids)
+                remove_documents(self.db.connection(), "response", [r.id for rows in responses.values() for r in rows])
+                for model in (InterviewResponse, Report, CallEvent):
+                    self.db.query(model).filter(model.interview_id.in_(ids)).delete(synchronize_session=False)
+                self.db.query(Interview).filter(Interview.id.in_(ids)).delete(synchronize_session=False)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self.db.expunge_all()
+
+        return counts
+
+    def _group(self, model, interview_ids: List[int]) -> Dict[int, List[Any]]:
+        grouped: Dict[int, List[Any]] = {}
+        for row in self.db.query(model).filter(model.interview_id.in_(interview_ids)).order_by(model.id):
+            grouped.setdefault(row.interview_id, []).append(row)
+        return grouped
+
+    def _payloads(self, query) -> List[Dict[str, Any]]:
+        return [decompress_payload(row.codec, row.payload) for row in query]
+
+    def get_interview_payload(self, interview_id: int) -> Optional[Dict[str, Any]]:
+        """
+        The archived payload of an interview, or None when it isn't archived or
+        the blob doesn't belong to the row (same interview and candidate)
+        """
+        row = self.db.query(ArchivedInterview).filter(ArchivedInterview.interview_id == interview_id).first()
+        if row is None:
+            return None
+        payload = decompress_payload(row.codec, row.payload)
+        interview = payload.get("interview", {})
+        if interview.get("id") != interview_id or interview.get("candidate_id") != row.candidate_id:
+            print(f"DEBUG: Archived payload of interview {interview_id} does not match its row, ignoring it")
+            return None
+        return payload
+
+    def get_interview_reports(self, interview_id: int) -> List[Dict[str, Any]]:
+        """
+        All report versions of an archived interview, oldest first
+        """
+        payload = self.get_interview_payload(interview_id)
+        if payload is None:
+            return []
+        return [_report_from_archive(r) for r in payload["reports"]]
+
+    def _current_reports(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Versions are archived oldest first, the last one is current
+        return [_report_from_archive(p["reports"][-1]) for p in payloads if p["reports"]]
+
+    def iter_current_reports(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        The current report of every archived interview, decoded a batch at a time
+        """
+        query = self.db.query(ArchivedInterview.codec, ArchivedInterview.payload).filter(
+            ArchivedInterview.report_count > 0
+        ).order_by(ArchivedInterview.interview_id).yield_per(batch_size)
+        for row in query:
+            yield from self._current_reports([decompress_payload(row.codec, row.payload)])
+
+    def get_candidate_reports(self, candidate_id: int) -> List[Dict[str, Any]]:
+        payloads = self._payloads(
+            self.db.query(ArchivedInterview).filter(
+                ArchivedInterview.candidate_id == candidate_id
+            ).order_by(ArchivedInterview.interview_id)
+        )
+        return self._current_reports(payloads)
+
+    def list_reports(self, skip: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Page through archived reports in interview order, one current report per
+        interview. Only the blobs on the page are decoded.
+        """
+        return self._current_reports(self._payloads(
+            self.db.query(ArchivedInterview).filter(
+                ArchivedInterview.report_count > 0
+            ).order_by(ArchivedInterview.interview_id).offset(skip).limit(limit)
+        ))
@@ -0,0 +1,192 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import CallEvent
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import numpy as np
+
+ANSWERED_STATUS = "in-progress"
+DIAL_STATUSES = ("queued", "initiated")
+FAILED_STATUSES = ("busy", "failed", "no-answer", "canceled")
+
+def parse_twilio_timestamp(value: Optional[str]) -> datetime:
+    """
+    Parse Twilio's RFC 2822 Timestamp field into naive UTC, defaulting to now
+    """
+    if value:
+        try:
+            parsed = parsedate_to_datetime(value)
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        except (TypeError, ValueError):
+            pass
+    return datetime.utcnow()
+
+class CallEventQueue:
+    """
+    In-process queue of status callbacks written to call_events in batches.
+    A batch is flushed when it reaches CALL_EVENT_BATCH_SIZE events or when
+    CALL_EVENT_FLUSH_SECONDS have passed since the first queued event.
+    A batch that fails to write is queued again, up to max_pending events.
+    """
+    def __init__(self, batch_size: int, flush_seconds: float, max_pending: int = 10000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, event: Dict[str, Any]) -> None:
+        self.start()
+        self._pending.append(event)
+        # The first event of a batch starts the flush timer, a full batch flushes at once
+        if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if len(self._pending) < self.batch_size:
+                # Give the batch time to fill before writing
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_seconds)
+                    self._wakeup.clear()
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error flushing call events: {e}")
+                # Retry the requeued events after a pause instead of spinning
+                await asyncio.sleep(self.flush_seconds)
+                self._wakeup.set()
+
+    async def flush(self) -> int:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception:
+            # Put the batch back ahead of events queued meanwhile; past the cap
+            # the oldest events are dropped
+            self._pending = batch + self._pending
+            dropped = len(self._pending) - self.max_pending
+            if dropped > 0:
+                print(f"Error: dropping {dropped} call events, queue is full")
+                self._pending = self._pending[dropped:]
+            raise
+        return len(batch)
+
+    @staticmethod
+    def _write(batch: List[Dict[str, Any]]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(CallEvent), batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+call_event_queue = CallEventQueue(
+    settings.CALL_EVENT_BATCH_SIZE, settings.CALL_EVENT_FLUSH_SECONDS, settings.CALL_EVENT_MAX_PENDING
+)
+
+class CallEventService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def stats(self, since_hours: int = 24) -> Dict[str, Any]:
+        """
+        Dial-to-answer latency and call throughput over a time window
+        """
+        since = datetime.utcnow() - timedelta(hours=since_hours)
+        rows = self.db.query(
+            CallEvent.call_sid, CallEvent.call_status, CallEvent.event_at, CallEvent.call_duration
+        ).filter(CallEvent.event_at >= since).all()
+
+        dialed: Dict[str, datetime] = {}
+        answered: Dict[str, datetime] = {}
+        # Twilio may deliver a callback more than once, so calls are counted by sid
+        durations: Dict[str, int] = {}
+        completed = set()
+        failed = set()
+        for call_sid, status, event_at, duration in rows:
+            if status in DIAL_STATUSES:
+                if call_sid not in dialed or event_at < dialed[call_sid]:
+                    dialed[call_sid] = event_at
+            elif status == ANSWERED_STATUS:
+                if call_sid not in answered or event_at < answered[call_sid]:
+                    answered[call_sid] = event_at
+            elif status == "completed":
+                completed.add(call_sid)
+                if duration is not None:
+                    durations[call_sid] = duration
+            elif status in FAILED_STATUSES:
+                failed.add(call_sid)
+
+        latencies = np.array([
+            (answered[sid] - dialed[sid]).total_seconds()
+            for sid in answered.keys() & dialed.keys()
+        ], dtype=np.float64)
+        durations_arr = np.array(list(durations.values()), dtype=np.float64)
+
+        dial_times = np.array([dt.timestamp() for dt in dialed.values()], dtype=np.float64)
+        per_hour = []
+        if dial_times.size:
+            start = min(dialed.values()).replace(minute=0, second=0, microsecond=0)
+            hours = ((dial_times - start.timestamp()) // 3600).astype(np.int64)
+            counts = np.bincount(hours)
+            per_hour = [
+                {"hour": (start + timedelta(hours=i)).isoformat(), "calls": int(count)}
+                for i, count in enumerate(counts) if count
+            ]
+
+        def summarize(values: np.ndarray) -> Dict[str, float]:
+            if values.size == 0:
+                return {"count": 0}
+            p50, p90, p99 = np.percentile(values, (50, 90, 99))
+            return {
+                "count": int(values.size),
+                "mean": round(float(values.mean()), 2),
+                "p50": round(float(p50), 2),
+                "p90": round(float(p90), 2),
+                "p99": round(float(p99), 2),
+                "max": round(float(values.max()), 2)
+            }
+
+        return {
+            "since": since.isoformat(),
+            "calls_dialed": len(dialed),
+            "calls_answered": len(answered),
+            "calls_completed": len(completed),
+            "calls_failed": len(failed),
+            "answer_rate": round(len(answered) / len(dialed), 3) if dialed else 0.0,
+            "dial_to_answer_seconds": summarize(latencies),
+            "call_duration_seconds": summarize(durations_arr),
+            "calls_per_hour": per_hour
+        }
@@ -1,12 +1,47 @@
 from groq import Groq
 from app.core.config import settings
-from typing import List, Dict, Any
+from app.services.model_router import model_router
+from typing import Awaitable, Callable, List, Dict, Any, Optional
+import asyncio
 import json
+import time
 
 class GroqService:
-    def __init__(self):
+    def __init__(self, before_request: Optional[Callable[[], Awaitable[None]]] = None):
         self.client = Groq(api_key=settings.GROQ_API_KEY)
-        self.model = "llama-3.3-70b-versatile"  # Using llama-3.3-70b-versatile
+        self.routes = settings.GROQ_MODEL_ROUTES
+        # Awaited before every API request, fallbacks included, e.g. a rate limiter
+        self.before_request = before_request
+
+    async def _complete(self, task: str, prompt: str, temperature: float, max_tokens: int):
+        """
+        Run a chat completion on the task's models in routing order, falling back on errors
+        """
+        models = self.routes.get(task)
+        if not models:
+            raise ValueError(f"No Groq models configured for task {task}")
+        last_error = None
+        for model in model_router.order(task, models):
+            if self.before_request is not None:
+                await self.before_request()
+            started = time.monotonic()
+            try:
+                # The SDK client is blocking; keep it off the event loop
+                response = await asyncio.to_thread(
+                    self.client.chat.completions.create,
+                    messages=[{"role": "user", "content": prompt}],
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            except Exception as e:
+                model_router.record(task, model, time.monotonic() - started, success=False)
+                print(f"DEBUG: Groq model {model} failed for {task}: {e}")
+                last_error = e
+                continue
+            model_router.record(task, model, time.monotonic() - started, success=True)
+            return response
+        raise last_error
 
     async def generate_interview_questions(self, job_description: str, num_questions: int = 5) -> List[Dict[str, Any]]:
         prompt = f"""
@@ -31,12 +66,7 @@ class GroqService:
         ]
         """
 
-        response = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=self.model,
-            temperature=0.7,
-            max_tokens=1000
-        )
+        response = await self._complete("generate_interview_questions", prompt, temperature=0.7, max_tokens=1000)
 
         try:
             questions = json.loads(response.choices[0].message.content)
@@ -63,12 +93,7 @@ class GroqService:
         }}
         """
 
-        response = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=self.model,
-            temperature=0.3,
-            max_tokens=1000
-        )
+        response = await self._complete("analyze_response", prompt, temperature=0.3, max_tokens=1000)
 
         try:
             analysis = json.loads(response.choices[0].message.content)
@@ -99,12 +124,7 @@ class GroqService:
         }}
         """
 
-        response = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=self.model,
-            temperature=0.3,
-            max_tokens=2000
-        )
+        response = await self._complete("generate_final_report", prompt, temperature=0.3, max_tokens=2000)
 
         try:
             report = json.loads(response.choices[0].message.content)
@@ -1,8 +1,12 @@
 from app.services.groq_service import GroqService
 from app.services.twilio_service import TwilioService
-from app.db.models import Interview, Report, Candidate, InterviewResponse
+from app.services.similarity import job_description_index
+from app.services.jobs import JobService
+from app.db.models import Interview, Job, Report, Candidate, InterviewResponse
+from app.core.config import settings
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
@@ -12,15 +16,56 @@ class InterviewService:
         self.groq_service = GroqService()
         self.twilio_service = TwilioService()
 
+    async def get_questions(self, interview: Interview) -> List[Dict[str, Any]]:
+        """
+        Get the interview's questions, generating them only when no stored set fits.
+        Questions belong to the interview's job, so every candidate for a role gets
+        the same set. A new job reuses the set of an earlier job whose description
+        is a near-duplicate, so reworded or re-branded postings skip the LLM call.
+        """
+        if interview.questions:
+            # Set generated for this interview before jobs existed
+            return interview.questions
+
+        job = interview.job
+        if job is None:
+            return []
+        if job.questions:
+            return job.questions
+
+        job_description_index.ensure_loaded(self.db)
+        questions = None
+        match = job_description_index.find_similar(job.description)
+        if match and match[0] != job.id and match[1] >= settings.JD_SIMILARITY_THRESHOLD:
+            source = self.db.query(Job).filter(Job.id == match[0]).first()
+            if source and source.questions:
+                print(f"DEBUG: Reusing questions from job {source.id} (similarity {match[1]:.2f})")
+                questions = source.questions
+
+        generated = questions is None
+        if generated:
+            questions = await self.groq_service.generate_interview_questions(job.description)
+            if not questions:
+                # Don't store a failed generation, try again next time
+                return questions
+
+        job.questions = questions
+        self.db.commit()
+        if generated:
+            # Near-duplicates resolve to the original entry, so only new sets are indexed
+            job_description_index.add(job.id, job.description)
+        return questions
+
     async def schedule_interview(self, candidate_id: int, job_description: str, scheduled_at: datetime) -> Dict[str, Any]:
         """
         Schedule a new interview
         """
         try:
-            # Create interview record
+            # Create interview record; interviews for the same role share one job row
+            job = JobService(self.db).get_or_create(job_description)
             interview = Interview(
                 candidate_id=candidate_id,
-                job_description=job_description,
+                job_id=job.id,
                 status="scheduled",
                 scheduled_at=scheduled_at
             )
@@ -28,8 +73,8 @@ class InterviewService:
             self.db.commit()
             self.db.refresh(interview)
 
-            # Generate questions
-            questions = await self.groq_service.generate_interview_questions(job_description)
+            # Generate questions, or reuse them from a near-duplicate job description
+            questions = await self.get_questions(interview)
             
             return {
                 "success": True,
@@ -57,7 +102,7 @@ class InterviewService:
                 return {"success": False, "error": "Candidate not found"}
 
             # Generate questions if not already generated
-            questions = await self.groq_service.generate_interview_questions(interview.job_description)
+            questions = await self.get_questions(interview)
             
             # Initiate call
             call_result = self.twilio_service.initiate_call(candidate.phone, str(interview_id))
@@ -82,6 +127,33 @@ class InterviewService:
                 "error": str(e)
             }
 
+    def record_response(self, interview_id: int, question_index: int, question: str, response: str, call_sid: Optional[str] = None) -> bool:
+        """
+        Store a candidate's answer once per question.
+        Returns False when the answer was already stored, e.g. by a retried webhook.
+        """
+        already_answered = self.db.query(InterviewResponse.id).filter(
+            InterviewResponse.interview_id == interview_id,
+            InterviewResponse.question_index == question_index
+        ).first() is not None
+        if already_answered:
+            return False
+
+        try:
+            self.db.add(InterviewResponse(
+                interview_id=interview_id,
+                question_index=question_index,
+                question=question,
+                response=response,
+                call_sid=call_sid
+            ))
+            self.db.commit()
+            return True
+        except IntegrityError:
+            # A concurrent retry stored this answer first
+            self.db.rollback()
+            return False
+
     async def process_response(self, interview_id: int, question_index: int, response: str) -> Dict[str, Any]:
         """
         Process candidate's response to a question
@@ -92,7 +164,7 @@ class InterviewService:
                 return {"success": False, "error": "Interview not found"}
 
             # Get the question
-            questions = await self.groq_service.generate_interview_questions(interview.job_description)
+            questions = await self.get_questions(interview)
             if question_index >= len(questions):
                 return {"success": False, "error": "Invalid question index"}
 
@@ -115,6 +187,44 @@ class InterviewService:
                 "error": str(e)
             }
 
+    @staticmethod
+    def report_input(job_description: str, responses: List[InterviewResponse]) -> Dict[str, Any]:
+        """
+        Interview data sent to the LLM for the final report
+        """
+        return {
+            "job_description": job_description,
+            "responses": [
+                {"question_index": r.question_index, "response": r.response}
+                for r in responses
+            ]
+        }
+
+    @staticmethod
+    def clamp_score(value: Any) -> int:
+        """
+        The model's overall score as an integer in 0-100; anything unparseable is 0
+        """
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            return 0
+        if score != score:  # NaN
+            return 0
+        return int(round(min(100.0, max(0.0, score))))
+
+    @staticmethod
+    def build_report(interview_id: int, report_data: Dict[str, Any], version: int = 1) -> Report:
+        return Report(
+            interview_id=interview_id,
+            overall_score=InterviewService.clamp_score(report_data.get("overall_score")),
+            strengths=report_data.get("strengths", ""),
+            weaknesses=report_data.get("weaknesses", ""),
+            detailed_analysis=report_data.get("detailed_analysis", ""),
+            recommendations=report_data.get("recommendations", ""),
+            version=version
+        )
+
     async def complete_interview(self, interview_id: int) -> Dict[str, Any]:
         """
         Complete the interview and generate final report
@@ -124,28 +234,30 @@ class InterviewService:
             if not interview:
                 return {"success": False, "error": "Interview not found"}
 
+            # Completing twice must not pay for another report or add a second row
+            # Re-scoring appends versions, the newest row is the current report
+            existing = self.db.query(Report).filter(Report.interview_id == interview_id).order_by(Report.id.desc()).first()
+            if interview.status == "completed" and existing:
+                return {
+                    "success": True,
+                    "report": {
+                        "overall_score": existing.overall_score,
+                        "strengths": existing.strengths,
+                        "weaknesses": existing.weaknesses,
+                        "detailed_analysis": existing.detailed_analysis,
+                        "recommendations": existing.recommendations
+                    }
+                }
+
             # Get all responses
             responses = self.db.query(InterviewResponse).filter(InterviewResponse.interview_id == interview_id).all()
-            interview_data = {
-                "job_description": interview.job_description,
-                "responses": [
-                    {"question_index": r.question_index, "response": r.response}
-                    for r in responses
-                ]
-            }
+            interview_data = self.report_input(interview.job_description, responses)
 
-            # Generate final report without a quantitative score
+            # Generate final report
             report_data = await self.groq_service.generate_final_report(interview_data)
 
             # Create report record
-            report = Report(
-                interview_id=interview_id,
-                overall_score=0,  # Set score to 0 as it's not used
-                strengths=report_data.get("strengths", ""),
-                weaknesses=report_data.get("weaknesses", ""),
-                detailed_analysis=report_data.get("detailed_analysis", ""),
-                recommendations=report_data.get("recommendations", "")
-            )
+            report = self.build_report(interview_id, report_data)
             self.db.add(report)
 
             # Update interview status
@@ -0,0 +1,35 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from app.db.models import Job
+import hashlib
+
+def job_content_hash(description: str) -> str:
+    """
+    Hash of a job description with whitespace and case normalized, so pasted
+    copies of the same posting map to one job
+    """
+    normalized = " ".join((description or "").split()).casefold()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_or_create(self, description: str) -> Job:
+        """
+        The job for a description, created on first use
+        """
+        content_hash = job_content_hash(description)
+        job = self.db.query(Job).filter(Job.content_hash == content_hash).first()
+        if job:
+            return job
+
+        try:
+            job = Job(content_hash=content_hash, description=description.strip())
+            self.db.add(job)
+            self.db.commit()
+            return job
+        except IntegrityError:
+            # Created concurrently for another interview of the same role
+            self.db.rollback()
+            return self.db.query(Job).filter(Job.content_hash == content_hash).one()
@@ -0,0 +1,255 @@
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import Interview, Candidate, InterviewResponse
+from app.services.interview import InterviewService
+from typing import Any, Dict, List, Optional
+import base64
+import importlib
+import json
+import numpy as np
+
+SAMPLE_RATE = 8000  # Twilio Media Streams carry 8 kHz mono mu-law audio
+PLAYBACK_CHUNK_BYTES = SAMPLE_RATE // 5  # 200 ms of audio per outbound media message
+
+def _mulaw_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+_MULAW_DECODE = _mulaw_decode_table()
+
+def mulaw_to_pcm16(data: bytes) -> np.ndarray:
+    return _MULAW_DECODE[np.frombuffer(data, dtype=np.uint8)]
+
+def pcm16_to_mulaw(samples: np.ndarray) -> bytes:
+    values = samples.astype(np.int32)
+    sign = (values < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(values), 32635) + 0x84
+    exponent = np.clip(np.floor(np.log2(magnitude)).astype(np.int32) - 7, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+class TurnDetector:
+    """
+    Energy-based end-of-turn detection over inbound audio.
+    A turn ends after end_of_turn_ms of silence following at least min_speech_ms
+    of speech, or when no speech starts within no_speech_timeout_ms (mirrors the
+    Gather timeout, yielding an empty utterance).
+    """
+    def __init__(
+        self,
+        energy_threshold: float,
+        end_of_turn_ms: int,
+        no_speech_timeout_ms: int,
+        min_speech_ms: int = 200,
+        max_turn_ms: int = 60000
+    ):
+        self.energy_threshold = energy_threshold
+        self.end_of_turn_samples = end_of_turn_ms * SAMPLE_RATE // 1000
+        self.no_speech_timeout_samples = no_speech_timeout_ms * SAMPLE_RATE // 1000
+        self.min_speech_samples = min_speech_ms * SAMPLE_RATE // 1000
+        self.max_turn_samples = max_turn_ms * SAMPLE_RATE // 1000
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks: List[np.ndarray] = []
+        self._waited = 0
+        self._speech = 0
+        self._silence = 0
+        self._total = 0
+
+    def feed(self, samples: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Add inbound samples; returns the utterance once the turn has ended
+        """
+        if samples.size == 0:
+            return None
+        rms = float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+        voiced = rms >= self.energy_threshold
+
+        if self._speech == 0 and not voiced:
+            self._waited += samples.size
+            if self._waited >= self.no_speech_timeout_samples:
+                self.reset()
+                return np.zeros(0, dtype=np.int16)
+            return None
+
+        self._chunks.append(samples)
+        self._total += samples.size
+        if voiced:
+            self._speech += samples.size
+            self._silence = 0
+        else:
+            self._silence += samples.size
+
+        ended = self._silence >= self.end_of_turn_samples and self._speech >= self.min_speech_samples
+        if ended or self._total >= self.max_turn_samples:
+            utterance = np.concatenate(self._chunks)
+            self.reset()
+            return utterance
+        if self._silence >= self.end_of_turn_samples:
+            # Too short to be an answer (a click or cough), keep listening
+            self.reset()
+        return None
+
+class SpeechBackend:
+    """
+    Speech-to-text and text-to-speech used by the streaming engine.
+    Configure an implementation with STREAM_SPEECH_BACKEND="package.module:ClassName".
+    """
+    async def transcribe(self, pcm16: bytes, sample_rate: int) -> str:
+        raise NotImplementedError
+
+    async def synthesize(self, text: str) -> bytes:
+        """
+        Return 8 kHz mu-law audio for the text
+        """
+        raise NotImplementedError
+
+def load_speech_backend() -> Optional[SpeechBackend]:
+    if not settings.STREAM_SPEECH_BACKEND:
+        return None
+    module_name, _, class_name = settings.STREAM_SPEECH_BACKEND.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+class StreamingInterviewSession:
+    """
+    Runs an interview over a bidirectional Twilio media stream.
+    Turn detection and question playback happen in-process; answers and the
+    final report go through InterviewService like the <Gather> call flow, so a
+    call can resume from the stored responses.
+    """
+    def __init__(self, websocket: WebSocket, db: Session, backend: SpeechBackend, interview_id: int):
+        self.websocket = websocket
+        self.db = db
+        self.backend = backend
+        self.interview_id = interview_id
+        self.service = InterviewService(db)
+        self.detector = TurnDetector(
+            settings.STREAM_ENERGY_THRESHOLD,
+            settings.STREAM_END_OF_TURN_MS,
+            settings.STREAM_NO_SPEECH_TIMEOUT_MS
+        )
+        self.stream_sid: Optional[str] = None
+        self.call_sid: Optional[str] = None
+        self.questions: List[Dict[str, Any]] = []
+        self.question_index = 0
+        self.pending_mark: Optional[str] = None
+        self.finished = False
+
+    async def run(self) -> None:
+        try:
+            while not self.finished:
+                message = json.loads(await self.websocket.receive_text())
+                event = message.get("event")
+                if event == "start":
+                    await self._on_start(message)
+                elif event == "media":
+                    await self._on_media(message)
+                elif event == "mark":
+                    self._on_mark(message)
+                elif event == "stop":
+                    break
+        except WebSocketDisconnect:
+            print(f"DEBUG: Media stream for interview {self.interview_id} disconnected")
+
+    async def _on_start(self, message: Dict[str, Any]) -> None:
+        start = message.get("start", {})
+        self.stream_sid = start.get("streamSid") or message.get("streamSid")
+        self.call_sid = start.get("callSid")
+
+        interview = self.db.query(Interview).filter(Interview.id == self.interview_id).first()
+        if not interview or interview.status == "completed":
+            await self._say("Thank you, your interview is already complete.", "goodbye")
+            return
+
+        candidate = self.db.query(Candidate).filter(Candidate.id == interview.candidate_id).first()
+        self.questions = await self.service.get_questions(interview)
+        answered = {
+            r.question_index for r in self.db.query(InterviewResponse.question_index).filter(
+                InterviewResponse.interview_id == self.interview_id
+            )
+        }
+        self.question_index = next((i for i in range(len(self.questions)) if i not in answered), len(self.questions))
+
+        if not self.questions:
+            # Question generation failed; leave the interview open for a retry
+            await self._say("Sorry, an application error occurred. Please try again later.", "goodbye")
+            return
+        if self.question_index >= len(self.questions):
+            await self._finish("")
+            return
+
+        candidate_name = candidate.name if candidate else "Candidate"
+        job_role = interview.job_description[:60] + ("..." if len(interview.job_description) > 60 else "")
+        if self.question_index == 0:
+            greeting = f"Hello {candidate_name}, this is an automated interview for the job role you have applied for: {job_role}. Let's begin your interview. "
+        else:
+            greeting = f"Welcome back {candidate_name}. Let's continue your interview. "
+        await self._ask(greeting)
+
+    async def _on_media(self, message: Dict[str, Any]) -> None:
+        media = message.get("media", {})
+        # Ignore audio while a prompt is still playing
+        if self.pending_mark or media.get("track", "inbound") != "inbound" or not self.questions:
+            return
+        utterance = self.detector.feed(mulaw_to_pcm16(base64.b64decode(media.get("payload", ""))))
+        if utterance is not None:
+            await self._on_turn(utterance)
+
+    def _on_mark(self, message: Dict[str, Any]) -> None:
+        name = message.get("mark", {}).get("name")
+        if name != self.pending_mark:
+            return
+        self.pending_mark = None
+        self.detector.reset()
+        if name == "goodbye":
+            self.finished = True
+
+    async def _on_turn(self, utterance: np.ndarray) -> None:
+        text = ""
+        if utterance.size:
+            text = (await self.backend.transcribe(utterance.tobytes(), SAMPLE_RATE) or "").strip()
+
+        question = self.questions[self.question_index]["question"]
+        if text.lower().rstrip(".!") == "please repeat":
+            await self._say(f"Of course. {question}", f"question-{self.question_index}")
+            return
+
+        self.service.record_response(self.interview_id, self.question_index, question, text, self.call_sid)
+        self.question_index += 1
+
+        prefix = "" if text else "We did not receive your response. Let's move to the next question. "
+        if self.question_index < len(self.questions):
+            await self._ask(prefix)
+        else:
+            await self._finish(prefix)
+
+    async def _ask(self, prefix: str = "") -> None:
+        question = self.questions[self.question_index]["question"]
+        await self._say(f"{prefix}Question {self.question_index + 1}: {question}", f"question-{self.question_index}")
+
+    async def _finish(self, prefix: str) -> None:
+        await self.service.complete_interview(self.interview_id)
+        await self._say(f"{prefix}Thank you for your time. Your interview is now complete. Have a great day!", "goodbye")
+
+    async def _say(self, text: str, mark: str) -> None:
+        """
+        Stream synthesized audio to the caller followed by a mark Twilio echoes once played
+        """
+        audio = await self.backend.synthesize(text)
+        for offset in range(0, len(audio), PLAYBACK_CHUNK_BYTES):
+            await self.websocket.send_text(json.dumps({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"payload": base64.b64encode(audio[offset:offset + PLAYBACK_CHUNK_BYTES]).decode()}
+            }))
+        await self.websocket.send_text(json.dumps({
+            "event": "mark",
+            "streamSid": self.stream_sid,
+            "mark": {"name": mark}
+        }))
+        self.pending_mark = mark
@@ -0,0 +1,88 @@
+from app.core.config import settings
+from typing import Dict, Any, List, Tuple
+import threading
+import time
+
+class ModelStats:
+    def __init__(self):
+        self.calls = 0
+        self.latency = 0.0  # exponentially weighted seconds per call
+        self.error_rate = 0.0  # exponentially weighted share of failed calls
+        self.demoted_until = 0.0
+
+class ModelRouter:
+    """
+    Tracks latency and error rates per (task, model) and orders a task's models
+    so that slow or failing ones are tried after their fallbacks until a cooldown
+    passes. A long report generation doesn't count against the same model's
+    short answer analyses, and a model is demoted only for the task it fails.
+    """
+    SMOOTHING = 0.2
+    MIN_CALLS = 3
+
+    def __init__(self, slow_seconds: float, max_error_rate: float, demotion_seconds: float):
+        self.slow_seconds = slow_seconds
+        self.max_error_rate = max_error_rate
+        self.demotion_seconds = demotion_seconds
+        self._stats: Dict[Tuple[str, str], ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def order(self, task: str, models: List[str]) -> List[str]:
+        """
+        Configured order with models currently demoted for the task moved to the end
+        """
+        now = time.monotonic()
+        healthy, demoted = [], []
+        with self._lock:
+            for model in models:
+                stats = self._stats.get((task, model))
+                if stats and stats.demoted_until > now:
+                    demoted.append((stats.demoted_until, model))
+                    continue
+                if stats and stats.demoted_until:
+                    # Cooldown over: start measuring from scratch
+                    self._stats[(task, model)] = ModelStats()
+                healthy.append(model)
+        return healthy + [model for _, model in sorted(demoted)]
+
+    def record(self, task: str, model: str, latency: float, success: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault((task, model), ModelStats())
+            if stats.calls == 0:
+                stats.latency = latency
+                stats.error_rate = 0.0 if success else 1.0
+            else:
+                stats.latency += self.SMOOTHING * (latency - stats.latency)
+                stats.error_rate += self.SMOOTHING * ((0.0 if success else 1.0) - stats.error_rate)
+            stats.calls += 1
+
+            if stats.calls >= self.MIN_CALLS and stats.demoted_until == 0.0 and (
+                stats.latency > self.slow_seconds or stats.error_rate > self.max_error_rate
+            ):
+                stats.demoted_until = time.monotonic() + self.demotion_seconds
+                print(
+                    f"DEBUG: Demoting model {model} for {task} for {self.demotion_seconds:.0f}s "
+                    f"(latency {stats.latency:.2f}s, error rate {stats.error_rate:.2f})"
+                )
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Stats per task, then per model
+        """
+        now = time.monotonic()
+        tasks: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (task, model), stats in self._stats.items():
+                tasks.setdefault(task, {})[model] = {
+                    "calls": stats.calls,
+                    "latency_seconds": round(stats.latency, 3),
+                    "error_rate": round(stats.error_rate, 3),
+                    "demoted": stats.demoted_until > now
+                }
+        return tasks
+
+model_router = ModelRouter(
+    settings.GROQ_SLOW_MODEL_SECONDS,
+    settings.GROQ_MAX_ERROR_RATE,
+    settings.GROQ_MODEL_DEMOTION_SECONDS
+)
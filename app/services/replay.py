@@ -0,0 +1,272 @@
+"""
+Replays recorded webhook requests (see app.core.recording) against the app
+in-process, with Groq and Twilio replaced by local fakes, and profiles each
+endpoint with cProfile or a sampling profiler.
+"""
+from sqlalchemy.orm import Session
+from app.db.models import Candidate, Interview
+from app.services.jobs import JobService
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from collections import Counter, defaultdict
+from datetime import datetime
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import numpy as np
+
+class FakeGroqClient:
+    """
+    Stands in for groq.Groq: answers chat completions with canned JSON after
+    a fixed delay, so replays exercise the real parsing and routing code
+    """
+    def __init__(self, latency: float = 0.0, **kwargs):
+        self.latency = latency
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages: List[Dict[str, str]], model: str, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        if "interview questions" in prompt:
+            content = [
+                {"question": f"Replay question {i + 1}?", "criteria": "Clear answer", "skill": "general", "difficulty": 3}
+                for i in range(5)
+            ]
+        elif "interview report" in prompt:
+            content = {
+                "overall_score": 0,
+                "strengths": ["Communication"],
+                "weaknesses": ["System design"],
+                "detailed_analysis": "Replayed report",
+                "recommendations": "None",
+                "hiring_decision": "None"
+            }
+        else:
+            content = {"score": 3, "feedback": "Replayed analysis"}
+        message = SimpleNamespace(content=json.dumps(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], model=model)
+
+class FakeTwilioClient:
+    """
+    Stands in for twilio.rest.Client; calls are accepted without dialing
+    """
+    def __init__(self, *args, **kwargs):
+        self.calls = SimpleNamespace(create=self._create_call)
+        self._count = 0
+
+    def _create_call(self, **kwargs):
+        self._count += 1
+        return SimpleNamespace(sid=f"CAreplay{self._count:024d}", status="queued")
+
+def install_fakes(llm_latency: float = 0.0) -> None:
+    """
+    Make GroqService and TwilioService build fake clients from now on
+    """
+    import app.services.groq_service as groq_service
+    import app.services.twilio_service as twilio_service
+    groq_service.Groq = lambda **kwargs: FakeGroqClient(latency=llm_latency, **kwargs)
+    twilio_service.Client = FakeTwilioClient
+
+def endpoint_label(method: str, path: str) -> str:
+    """
+    Route-level name for a request path, e.g. "POST /api/v1/interviews/{id}/response/{id}"
+    """
+    return f"{method} {re.sub(r'/[0-9]+', '/{id}', path)}"
+
+def _file_label(label: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", label.replace("{id}", "id")).strip("_")
+
+# Leaf frames of threads that are parked, not working
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads every interval seconds and counts them
+    per label in folded form ("thread;outer;...;inner"), the input format of
+    flamegraph.pl and speedscope. Idle worker threads are skipped; the main
+    thread is always sampled so time spent waiting on the event loop shows up.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.label: Optional[str] = None
+        self.stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        main = threading.main_thread().ident
+        names = {}
+        while not self._stop.wait(self.interval):
+            label = self.label
+            if label is None:
+                continue
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident != main and os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[label][";".join(reversed(stack))] += 1
+
+    def write(self, output_dir: str) -> List[str]:
+        paths = []
+        for label, stacks in self.stacks.items():
+            path = os.path.join(output_dir, f"{_file_label(label)}.folded")
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
+
+def load_recording(path: str, call_sid: Optional[str] = None) -> List[Dict[str, Any]]:
+    entries = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if call_sid and entry.get("form", {}).get("CallSid") != call_sid:
+                continue
+            entries.append(entry)
+    return sorted(entries, key=lambda e: e["ts"])
+
+def seed_interviews(db: Session, entries: List[Dict[str, Any]]) -> int:
+    """
+    Create placeholder candidates and interviews for the ids the recording
+    refers to that don't exist in the replay database
+    """
+    interview_ids = sorted({
+        int(match.group(1)) for entry in entries
+        for match in [re.search(r"/interviews/(\d+)/", entry["path"])] if match
+    })
+    existing = {row.id for row in db.query(Interview.id).filter(Interview.id.in_(interview_ids))}
+    created = 0
+    for interview_id in interview_ids:
+        if interview_id in existing:
+            continue
+        candidate = Candidate(name=f"Replay {interview_id}", email=f"replay-{interview_id}@example.com", phone="+10000000000")
+        db.add(candidate)
+        db.flush()
+        db.add(Interview(
+            id=interview_id,
+            candidate_id=candidate.id,
+            job_id=JobService(db).get_or_create("Replayed interview").id,
+            status="in_progress",
+            scheduled_at=datetime.utcnow(),
+            started_at=datetime.utcnow()
+        ))
+        created += 1
+    db.commit()
+    return created
+
+class Replayer:
+    """
+    Sends recorded requests to the app one at a time, in recorded order, and
+    profiles each endpoint separately
+    """
+    def __init__(self, app, entries: List[Dict[str, Any]], profiler: str, output_dir: str, sample_interval: float = 0.005):
+        self.app = app
+        self.entries = entries
+        self.profiler = profiler
+        self.output_dir = output_dir
+        self.sampler = SamplingProfiler(sample_interval) if profiler == "sampling" else None
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.recorded: Dict[str, List[float]] = defaultdict(list)
+
+    async def run(self) -> Dict[str, Any]:
+        import httpx
+        from app.services.call_events import call_event_queue
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.sampler:
+            self.sampler.start()
+        try:
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+                for entry in self.entries:
+                    await self._send(client, entry)
+            await call_event_queue.stop()
+        finally:
+            if self.sampler:
+                self.sampler.stop()
+        return self._write()
+
+    async def _send(self, client, entry: Dict[str, Any]) -> None:
+        label = endpoint_label(entry["method"], entry["path"])
+        url = entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+        profile = None
+        if self.profiler == "cprofile":
+            # cProfile sees the event loop thread only; blocking work handed to
+            # worker threads shows up as time waiting on the loop
+            profile = self.profiles.setdefault(label, cProfile.Profile())
+            profile.enable()
+        elif self.sampler:
+            self.sampler.label = label
+        started = time.perf_counter()
+        try:
+            await client.request(entry["method"], url, data=entry.get("form") or None)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if profile:
+                profile.disable()
+            elif self.sampler:
+                self.sampler.label = None
+        self.durations[label].append(elapsed)
+        if entry.get("duration_ms") is not None:
+            self.recorded[label].append(entry["duration_ms"])
+
+    def _write(self) -> Dict[str, Any]:
+        files = []
+        for label, profile in self.profiles.items():
+            path = os.path.join(self.output_dir, f"{_file_label(label)}.prof")
+            profile.dump_stats(path)
+            files.append(path)
+        if self.sampler:
+            files.extend(self.sampler.write(self.output_dir))
+
+        def summarize(values: List[float]) -> Dict[str, float]:
+            if not values:
+                return {}
+            p50, p95 = np.percentile(values, (50, 95))
+            return {"p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "max_ms": round(max(values), 2)}
+
+        summary = {
+            "requests": len(self.entries),
+            "profiler": self.profiler,
+            "files": files,
+            "endpoints": {
+                label: {
+                    "count": len(values),
+                    "replayed": summarize(values),
+                    "recorded": summarize(self.recorded.get(label, []))
+                }
+                for label, values in self.durations.items()
+            }
+        }
+        with open(os.path.join(self.output_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
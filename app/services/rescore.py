@@ -0,0 +1,179 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+from app.db.models import Interview, InterviewResponse, Report
+from app.services.groq_service import GroqService
+from app.services.interview import InterviewService
+from app.services.search import remove_document
+from app.services.tags import untag_reports
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import asyncio
+import json
+import os
+import time
+
+def latest_report_ids():
+    """
+    Ids of the current report of each interview.
+    Re-scoring appends new versions, so the newest row per interview is current.
+    """
+    return select(func.max(Report.id)).group_by(Report.interview_id)
+
+class RateLimiter:
+    """
+    Spaces call starts evenly so no more than requests_per_minute begin per minute
+    """
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class Checkpoint:
+    """
+    Progress of a re-scoring run, stored as JSON so a crashed run can resume.
+    Interviews up to last_interview_id are done; failed ones are retried on resume.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.last_interview_id = 0
+        self.failed: List[int] = []
+        self.counts = {"rescored": 0, "failed": 0, "skipped": 0}
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            data = json.load(f)
+        self.started_at = datetime.fromisoformat(data["started_at"])
+        self.last_interview_id = data["last_interview_id"]
+        self.failed = data.get("failed", [])
+        self.counts.update(data.get("counts", {}))
+        return True
+
+    def save(self) -> None:
+        # Write then rename so a crash never leaves a truncated checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "started_at": self.started_at.isoformat(),
+                "last_interview_id": self.last_interview_id,
+                "failed": self.failed,
+                "counts": self.counts
+            }, f)
+        os.replace(tmp_path, self.path)
+
+class ReportRescorer:
+    """
+    Regenerates reports of completed interviews from their stored transcripts.
+    Interviews are read in id order one batch at a time, each batch is scored
+    concurrently under the rate limit and its new report versions are committed
+    together before the checkpoint advances.
+    """
+    def __init__(
+        self,
+        db: Session,
+        checkpoint: Checkpoint,
+        concurrency: int,
+        requests_per_minute: int,
+        batch_size: int = 50
+    ):
+        self.db = db
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        # Charged per API request, so model fallbacks count against the limit too
+        self.groq_service = GroqService(before_request=self.rate_limiter.wait)
+
+    async def run(self) -> Dict[str, int]:
+        retry, self.checkpoint.failed = self.checkpoint.failed, []
+        if retry:
+            self.checkpoint.counts["failed"] -= len(retry)
+            await self._process(retry)
+            self.checkpoint.save()
+
+        while True:
+            ids = [row.id for row in self.db.query(Interview.id).filter(
+                Interview.status == "completed",
+                Interview.id > self.checkpoint.last_interview_id
+            ).order_by(Interview.id).limit(self.batch_size)]
+            if not ids:
+                break
+            await self._process(ids)
+            self.checkpoint.last_interview_id = ids[-1]
+            self.checkpoint.save()
+
+        return self.checkpoint.counts
+
+    async def _process(self, interview_ids: List[int]) -> None:
+        interviews = self.db.query(Interview).options(selectinload(Interview.job)).filter(
+            Interview.id.in_(interview_ids)
+        ).order_by(Interview.id).all()
+        responses: Dict[int, List[InterviewResponse]] = {}
+        for response in self.db.query(InterviewResponse).filter(
+            InterviewResponse.interview_id.in_(interview_ids)
+        ).order_by(InterviewResponse.question_index):
+            responses.setdefault(response.interview_id, []).append(response)
+
+        current: Dict[int, Any] = {
+            row.interview_id: row for row in self.db.query(
+                Report.id, Report.interview_id, Report.version, Report.created_at
+            ).filter(Report.id.in_(latest_report_ids().where(Report.interview_id.in_(interview_ids))))
+        }
+
+        pending = []
+        for interview in interviews:
+            latest = current.get(interview.id)
+            if latest and latest.created_at >= self.checkpoint.started_at:
+                # Already re-scored by this run before a crash
+                self.checkpoint.counts["skipped"] += 1
+                continue
+            pending.append(interview)
+
+        results = await asyncio.gather(*[
+            self._score(interview, responses.get(interview.id, [])) for interview in pending
+        ])
+
+        try:
+            for interview, report_data in zip(pending, results):
+                if report_data is None:
+                    self.checkpoint.failed.append(interview.id)
+                    self.checkpoint.counts["failed"] += 1
+                    continue
+                latest = current.get(interview.id)
+                version = (latest.version or 1) + 1 if latest else 1
+                self.db.add(InterviewService.build_report(interview.id, report_data, version))
+                if latest:
+                    # Only the current version stays searchable and tagged
+                    remove_document(self.db.connection(), "report", latest.id)
+                    untag_reports(self.db.connection(), [latest.id])
+                self.checkpoint.counts["rescored"] += 1
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.expunge_all()
+
+    async def _score(self, interview: Interview, responses: List[InterviewResponse]) -> Optional[Dict[str, Any]]:
+        async with self.semaphore:
+            try:
+                report_data = await self.groq_service.generate_final_report(
+                    InterviewService.report_input(interview.job_description, responses)
+                )
+            except Exception as e:
+                print(f"DEBUG: Re-scoring interview {interview.id} failed: {e}")
+                return None
+        if report_data.get("detailed_analysis") == "Error in report generation":
+            # GroqService's fallback for an unparseable reply, keep the old version
+            print(f"DEBUG: Re-scoring interview {interview.id} returned no usable report")
+            return None
+        return report_data
@@ -0,0 +1,260 @@
+from sqlalchemy import event, func, select, text, true
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.db.models import Candidate, InterviewResponse, Report
+from typing import Dict, Any, List, Optional, Iterable
+import re
+
+# Document types stored in the index; the code is packed into the SQLite rowid
+DOC_TYPES = {"candidate": 1, "response": 2, "report": 3}
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        content,
+        doc_type UNINDEXED,
+        doc_id UNINDEXED,
+        candidate_id UNINDEXED,
+        interview_id UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """
+]
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_index (
+        id BIGSERIAL PRIMARY KEY,
+        doc_type VARCHAR(16) NOT NULL,
+        doc_id INTEGER NOT NULL,
+        candidate_id INTEGER,
+        interview_id INTEGER,
+        content TEXT NOT NULL,
+        content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_search_index_doc ON search_index (doc_type, doc_id)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_tsv ON search_index USING GIN (content_tsv)",
+]
+
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+def _is_supported(bind) -> bool:
+    return bind.dialect.name in ("postgresql", "sqlite")
+
+def init_search_index(engine: Engine) -> None:
+    """
+    Create the full-text index: FTS5 on SQLite, a tsvector column with a GIN index on Postgres
+    """
+    if not _is_supported(engine):
+        return
+    with engine.begin() as conn:
+        for statement in (POSTGRES_DDL if _is_postgres(engine) else SQLITE_DDL):
+            conn.execute(text(statement))
+
+def candidate_document(candidate: Candidate) -> str:
+    return " ".join(part for part in (candidate.name, candidate.email) if part)
+
+def report_document(report: Report) -> str:
+    parts = []
+    for tags in (report.strengths, report.weaknesses):
+        if isinstance(tags, list):
+            parts.extend(str(tag) for tag in tags)
+        elif tags:
+            parts.append(str(tags))
+    parts.extend(part for part in (report.detailed_analysis, report.recommendations) if part)
+    return "\n".join(parts)
+
+def index_documents(conn: Connection, documents: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insert or replace documents in the index, returning how many were written.
+    Each document has doc_type, doc_id, candidate_id, interview_id and content.
+    """
+    rows = [dict(doc) for doc in documents if doc.get("content")]
+    if not rows or not _is_supported(conn):
+        return 0
+
+    if _is_postgres(conn):
+        conn.execute(text("""
+            INSERT INTO search_index (doc_type, doc_id, candidate_id, interview_id, content)
+            VALUES (:doc_type, :doc_id, :candidate_id, :interview_id, :content)
+            ON CONFLICT (doc_type, doc_id) DO UPDATE SET
+                candidate_id = EXCLUDED.candidate_id,
+                interview_id = EXCLUDED.interview_id,
+                content = EXCLUDED.content
+        """), rows)
+    else:
+        for row in rows:
+            row["rowid"] = row["doc_id"] * len(DOC_TYPES) + DOC_TYPES[row["doc_type"]]
+        conn.execute(text("""
+            INSERT OR REPLACE INTO search_index (rowid, content, doc_type, doc_id, candidate_id, interview_id)
+            VALUES (:rowid, :content, :doc_type, :doc_id, :candidate_id, :interview_id)
+        """), rows)
+    return len(rows)
+
+def remove_document(conn: Connection, doc_type: str, doc_id: int) -> None:
+    remove_documents(conn, doc_type, [doc_id])
+
+def remove_documents(conn: Connection, doc_type: str, doc_ids: Iterable[int]) -> None:
+    doc_ids = list(doc_ids)
+    if not doc_ids or not _is_supported(conn):
+        return
+    if _is_postgres(conn):
+        conn.execute(
+            text("DELETE FROM search_index WHERE doc_type = :doc_type AND doc_id = :doc_id"),
+            [{"doc_type": doc_type, "doc_id": doc_id} for doc_id in doc_ids]
+        )
+    else:
+        conn.execute(
+            text("DELETE FROM search_index WHERE rowid = :rowid"),
+            [{"rowid": doc_id * len(DOC_TYPES) + DOC_TYPES[doc_type]} for doc_id in doc_ids]
+        )
+
+def _candidate_id_for_interview(conn: Connection, interview_id: Optional[int]) -> Optional[int]:
+    if interview_id is None:
+        return None
+    return conn.execute(
+        text("SELECT candidate_id FROM interviews WHERE id = :id"), {"id": interview_id}
+    ).scalar()
+
+# Incremental indexing: rows are indexed in the same transaction that writes them
+
+@event.listens_for(Candidate, "after_insert")
+@event.listens_for(Candidate, "after_update")
+def _index_candidate(mapper, connection, target):
+    index_documents(connection, [{
+        "doc_type": "candidate",
+        "doc_id": target.id,
+        "candidate_id": target.id,
+        "interview_id": None,
+        "content": candidate_document(target)
+    }])
+
+@event.listens_for(Candidate, "after_delete")
+def _unindex_candidate(mapper, connection, target):
+    remove_document(connection, "candidate", target.id)
+
+@event.listens_for(InterviewResponse, "after_insert")
+def _index_response(mapper, connection, target):
+    index_documents(connection, [{
+        "doc_type": "response",
+        "doc_id": target.id,
+        "candidate_id": _candidate_id_for_interview(connection, target.interview_id),
+        "interview_id": target.interview_id,
+        "content": target.response
+    }])
+
+@event.listens_for(Report, "after_insert")
+def _index_report(mapper, connection, target):
+    index_documents(connection, [{
+        "doc_type": "report",
+        "doc_id": target.id,
+        "candidate_id": _candidate_id_for_interview(connection, target.interview_id),
+        "interview_id": target.interview_id,
+        "content": report_document(target)
+    }])
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _fts5_query(query: str) -> str:
+        # Quote every term so user input can't inject FTS5 syntax; terms are ANDed
+        terms = re.findall(r"\w+", query, flags=re.UNICODE)
+        return " ".join(f'"{term}"' for term in terms)
+
+    def search(self, query: str, doc_type: Optional[str] = None, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over candidates, interview responses and reports
+        """
+        bind = self.db.get_bind()
+        if not _is_supported(bind):
+            return []
+
+        params = {"query": query, "doc_type": doc_type, "skip": skip, "limit": limit}
+        type_filter = "AND doc_type = :doc_type" if doc_type else ""
+
+        if _is_postgres(bind):
+            # Rank and paginate first so ts_headline only runs on the returned page
+            statement = f"""
+                SELECT page.doc_type, page.doc_id, page.candidate_id, page.interview_id, page.score,
+                       ts_headline('english', page.content, page.q, 'MaxWords=24, MinWords=8') AS snippet
+                FROM (
+                    SELECT doc_type, doc_id, candidate_id, interview_id, content, q,
+                           ts_rank_cd(content_tsv, q) AS score
+                    FROM search_index, websearch_to_tsquery('english', :query) AS q
+                    WHERE content_tsv @@ q {type_filter}
+                    ORDER BY score DESC, id
+                    LIMIT :limit OFFSET :skip
+                ) AS page
+                ORDER BY page.score DESC
+            """
+        else:
+            params["query"] = self._fts5_query(query)
+            if not params["query"]:
+                return []
+            statement = f"""
+                SELECT doc_type, doc_id, candidate_id, interview_id,
+                       -bm25(search_index) AS score,
+                       snippet(search_index, 0, '[', ']', '...', 16) AS snippet
+                FROM search_index
+                WHERE search_index MATCH :query {type_filter}
+                ORDER BY bm25(search_index)
+                LIMIT :limit OFFSET :skip
+            """
+
+        rows = self.db.execute(text(statement), params).mappings().all()
+        return [
+            {
+                "doc_type": row["doc_type"],
+                "doc_id": int(row["doc_id"]),
+                "candidate_id": int(row["candidate_id"]) if row["candidate_id"] is not None else None,
+                "interview_id": int(row["interview_id"]) if row["interview_id"] is not None else None,
+                "score": round(float(row["score"]), 6),
+                "snippet": row["snippet"]
+            }
+            for row in rows
+        ]
+
+    def rebuild(self, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Re-index every candidate, response and report, streaming rows in batches
+        """
+        conn = self.db.connection()
+        if _is_postgres(conn):
+            conn.execute(text("TRUNCATE search_index"))
+        elif _is_supported(conn):
+            conn.execute(text("DELETE FROM search_index"))
+
+        interview_candidates = dict(
+            conn.execute(text("SELECT id, candidate_id FROM interviews")).all()
+        )
+        counts = {}
+        # Only the current version of a re-scored report is searchable
+        current_reports = Report.id.in_(select(func.max(Report.id)).group_by(Report.interview_id))
+        sources = (
+            ("candidate", Candidate, true(), lambda c: (c.id, None, candidate_document(c))),
+            ("response", InterviewResponse, true(), lambda r: (interview_candidates.get(r.interview_id), r.interview_id, r.response)),
+            ("report", Report, current_reports, lambda r: (interview_candidates.get(r.interview_id), r.interview_id, report_document(r))),
+        )
+        for doc_type, model, condition, extract in sources:
+            batch = []
+            counts[doc_type] = 0
+            for row in self.db.query(model).filter(condition).order_by(model.id).yield_per(batch_size):
+                candidate_id, interview_id, content = extract(row)
+                batch.append({
+                    "doc_type": doc_type,
+                    "doc_id": row.id,
+                    "candidate_id": candidate_id,
+                    "interview_id": interview_id,
+                    "content": content
+                })
+                if len(batch) >= batch_size:
+                    counts[doc_type] += index_documents(conn, batch)
+                    batch = []
+            counts[doc_type] += index_documents(conn, batch)
+
+        self.db.commit()
+        return counts
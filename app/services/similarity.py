@@ -0,0 +1,147 @@
+from sqlalchemy.orm import Session
+from app.db.models import Job
+from typing import List, Optional, Set, Tuple
+from collections import Counter
+import numpy as np
+import re
+import threading
+import zlib
+
+# Phrases that appear in most postings and say nothing about the role itself
+BOILERPLATE_PATTERNS = [
+    r"\bhttps?://\S+",
+    r"\b[\w.+-]+@[\w-]+\.[\w.]+\b",
+    r"\b(we are|is) an equal opportunit(y|ies) employer\b[^.]*\.?",
+    r"\ball qualified applicants will receive consideration\b[^.]*\.?",
+    r"\b(about (us|the company)|who we are)\b[^.]*\.?",
+    r"\b(apply now|how to apply)\b[^.]*\.?",
+]
+
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 3
+# Closest MinHash matches re-checked with the exact, entity-aware similarity
+RERANK_CANDIDATES = 5
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures are comparable across processes and restarts
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+def normalize_job_description(text: str) -> str:
+    """
+    Lowercase, strip boilerplate, punctuation and extra whitespace
+    """
+    text = (text or "").lower()
+    for pattern in BOILERPLATE_PATTERNS:
+        text = re.sub(pattern, " ", text)
+    text = re.sub(r"[^a-z0-9+#]+", " ", text)
+    return " ".join(text.split())
+
+def _shingles(words: List[str]) -> Set[str]:
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def shingle_hashes(normalized: str) -> np.ndarray:
+    """
+    32-bit hashes of the word shingles of a normalized description
+    """
+    shingles = _shingles(normalized.split())
+    return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signature(normalized: str) -> np.ndarray:
+    """
+    MinHash signature computed for all permutations at once
+    """
+    hashes = shingle_hashes(normalized)
+    if hashes.size == 0:
+        return np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+    # (a * h + b) mod p, truncated to 32 bits: shape (permutations, shingles)
+    permuted = ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=1)
+
+def description_similarity(a: str, b: str) -> float:
+    """
+    Exact shingle Jaccard similarity of two normalized descriptions, ignoring
+    words that repeat within one description but never occur in the other.
+    Those are the recurring entities of a posting, such as the company or
+    product name, which differ between copies of the same role.
+    """
+    words_a, words_b = a.split(), b.split()
+    counts_a, counts_b = Counter(words_a), Counter(words_b)
+    entities = {word for word, count in counts_a.items() if count > 1 and word not in counts_b}
+    entities |= {word for word, count in counts_b.items() if count > 1 and word not in counts_a}
+    shingles_a = _shingles([word for word in words_a if word not in entities])
+    shingles_b = _shingles([word for word in words_b if word not in entities])
+    if not shingles_a and not shingles_b:
+        return 1.0
+    return len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+class JobDescriptionIndex:
+    """
+    In-memory MinHash index over the descriptions of jobs with stored questions
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids: List[int] = []
+        self._normalized: List[str] = []
+        self._signatures: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        rows = db.query(Job.id, Job.description).filter(
+            Job.questions.isnot(None)
+        ).all()
+        with self._lock:
+            if self._loaded:
+                return
+            for job_id, job_description in rows:
+                self._add_locked(job_id, job_description)
+            self._loaded = True
+
+    def _add_locked(self, job_id: int, job_description: str) -> None:
+        normalized = normalize_job_description(job_description)
+        self._ids.append(job_id)
+        self._normalized.append(normalized)
+        self._signatures.append(minhash_signature(normalized))
+        self._matrix = None
+
+    def add(self, job_id: int, job_description: str) -> None:
+        with self._lock:
+            self._add_locked(job_id, job_description)
+
+    def find_similar(self, job_description: str) -> Optional[Tuple[int, float]]:
+        """
+        Return (job_id, estimated Jaccard similarity) of the closest stored description
+        """
+        normalized = normalize_job_description(job_description)
+        signature = minhash_signature(normalized)
+        with self._lock:
+            if not self._ids:
+                return None
+            if self._matrix is None:
+                self._matrix = np.vstack(self._signatures)
+            # Fraction of matching MinHash slots estimates Jaccard similarity
+            scores = (self._matrix == signature).mean(axis=1)
+            candidates = np.argsort(-scores, kind="stable")[:RERANK_CANDIDATES]
+            # The estimate counts a swapped company name against the match, so
+            # the closest few are scored exactly with entities left out
+            best, score = max(
+                ((int(i), max(float(scores[i]), description_similarity(normalized, self._normalized[i])))
+                 for i in candidates),
+                key=lambda candidate: candidate[1]
+            )
+            return self._ids[best], score
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids, self._normalized, self._signatures = [], [], []
+            self._matrix = None
+            self._loaded = False
+
+job_description_index = JobDescriptionIndex()
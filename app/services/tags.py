@@ -0,0 +1,146 @@
+from sqlalchemy import and_, delete, event, func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.db.models import Report, ReportTag, Tag
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import re
+
+TAG_KINDS = {"strength": "strengths", "weakness": "weaknesses"}
+MAX_TAG_LENGTH = 200
+
+def normalize_tag(value: Any) -> str:
+    """
+    Canonical form of a strength/weakness label: lowercase, single spaces,
+    no surrounding punctuation
+    """
+    text = re.sub(r"\s+", " ", str(value or "")).strip().lower()
+    return text.strip(" .,;:!-")[:MAX_TAG_LENGTH]
+
+def report_tag_names(report: Any) -> List[Tuple[str, str]]:
+    """
+    (kind, normalized name) pairs of a report, without duplicates
+    """
+    pairs = []
+    for kind, field in TAG_KINDS.items():
+        values = getattr(report, field, None) if not isinstance(report, dict) else report.get(field)
+        if isinstance(values, str):
+            values = [values]
+        for value in values or []:
+            name = normalize_tag(value)
+            if name and (kind, name) not in pairs:
+                pairs.append((kind, name))
+    return pairs
+
+def intern_tags(conn: Connection, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Tag ids for the given normalized names, inserting the ones not seen before
+    """
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(conn.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    missing = [{"name": name} for name in names - ids.keys()]
+    if missing:
+        dialect = conn.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Concurrent writers may intern the same tag, let the unique index settle it
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            conn.execute(dialect_insert(Tag).on_conflict_do_nothing(index_elements=["name"]), missing)
+        else:
+            conn.execute(insert(Tag), missing)
+        ids.update(conn.execute(
+            select(Tag.name, Tag.id).where(Tag.name.in_([row["name"] for row in missing]))
+        ).all())
+    return ids
+
+def tag_reports(conn: Connection, reports: Iterable[Any]) -> int:
+    """
+    Write report_tags rows for reports (ORM rows or dicts with an id), returning the row count
+    """
+    tagged = [(report, report_tag_names(report)) for report in reports]
+    ids = intern_tags(conn, (name for _, pairs in tagged for _, name in pairs))
+    rows = [
+        {"report_id": report.id if not isinstance(report, dict) else report["id"], "tag_id": ids[name], "kind": kind}
+        for report, pairs in tagged for kind, name in pairs
+    ]
+    if rows:
+        conn.execute(insert(ReportTag), rows)
+    return len(rows)
+
+def untag_reports(conn: Connection, report_ids: List[int]) -> None:
+    if report_ids:
+        conn.execute(delete(ReportTag).where(ReportTag.report_id.in_(report_ids)))
+
+@event.listens_for(Report, "after_insert")
+def _tag_report(mapper, connection, target):
+    tag_reports(connection, [target])
+
+class TagService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def top_tags(self, kind: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Most frequent tags with the number of current reports carrying them
+        """
+        query = self.db.query(
+            Tag.name, ReportTag.kind, func.count(ReportTag.report_id).label("reports")
+        ).join(Tag, Tag.id == ReportTag.tag_id)
+        if kind:
+            query = query.filter(ReportTag.kind == kind)
+        rows = query.group_by(Tag.name, ReportTag.kind).order_by(
+            func.count(ReportTag.report_id).desc(), Tag.name
+        ).offset(skip).limit(limit)
+        return [{"tag": name, "kind": kind, "reports": count} for name, kind, count in rows]
+
+    def filter_reports(
+        self,
+        strengths: List[str],
+        weaknesses: List[str],
+        match_all: bool = True,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Report]:
+        """
+        Reports tagged with the given strengths and weaknesses; all of them when
+        match_all, otherwise any. Matching uses the (tag_id, kind) index only.
+        """
+        wanted = {("strength", normalize_tag(s)) for s in strengths} | {("weakness", normalize_tag(w)) for w in weaknesses}
+        wanted = {(kind, name) for kind, name in wanted if name}
+        if not wanted:
+            return []
+
+        ids = dict(self.db.query(Tag.name, Tag.id).filter(Tag.name.in_({name for _, name in wanted})))
+        criteria = [(kind, ids[name]) for kind, name in wanted if name in ids]
+        if not criteria or (match_all and len(criteria) < len(wanted)):
+            return []
+
+        matches = select(ReportTag.report_id).where(or_(*[
+            and_(ReportTag.tag_id == tag_id, ReportTag.kind == kind) for kind, tag_id in criteria
+        ])).group_by(ReportTag.report_id)
+        if match_all:
+            # (report, tag, kind) is the primary key, so a report matching every pair has one row per pair
+            matches = matches.having(func.count() == len(criteria))
+
+        return self.db.query(Report).filter(Report.id.in_(matches)).order_by(Report.id).offset(skip).limit(limit).all()
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """
+        Re-tag every current report from its strengths and weaknesses
+        """
+        conn = self.db.connection()
+        conn.execute(delete(ReportTag))
+        current = select(func.max(Report.id)).group_by(Report.interview_id)
+        count = 0
+        batch = []
+        for report in self.db.query(Report.id, Report.strengths, Report.weaknesses).filter(
+            Report.id.in_(current)
+        ).order_by(Report.id).yield_per(batch_size):
+            batch.append({"id": report.id, "strengths": report.strengths, "weaknesses": report.weaknesses})
+            if len(batch) >= batch_size:
+                count += tag_reports(conn, batch)
+                batch = []
+        count += tag_reports(conn, batch)
+        self.db.commit()
+        return count
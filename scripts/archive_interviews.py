@@ -0,0 +1,39 @@
+"""
+Move completed interviews older than a cutoff, with their transcripts, reports
+and call events, into compressed rows of archived_interviews. Report endpoints
+keep serving archived reports transparently.
+
+Usage:
+    python scripts/archive_interviews.py [--older-than-days 180] [--batch-size 100]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.database import SessionLocal, init_db
+from app.services.archive import ArchiveService
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        counts = ArchiveService(db).archive_completed(args.older_than_days, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(
+        f"Archived {counts['interviews']} interviews "
+        f"({counts['responses']} responses, {counts['reports']} reports) "
+        f"into {counts['bytes']} compressed bytes"
+    )
+
+if __name__ == "__main__":
+    main()
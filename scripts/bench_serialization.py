@@ -0,0 +1,100 @@
+"""
+Micro-benchmark comparing the cost of serializing 1,000 listing rows through the
+default FastAPI response_model path against the fast response path.
+
+Usage:
+    python scripts/bench_serialization.py [--rows 1000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.api.endpoints.candidates import CandidateResponse, candidate_list_adapter
+from app.api.endpoints.reports import ReportResponse, report_list_adapter
+from app.core import responses
+
+def make_candidates(n: int) -> list:
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(id=i, name=f"Candidate {i}", email=f"candidate{i}@example.com",
+                        phone="+910000000000", created_at=now, updated_at=now)
+        for i in range(n)
+    ]
+
+def make_reports(n: int) -> list:
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(id=i, interview_id=i, overall_score=70,
+                        strengths=["Communication", "Python", "System design"],
+                        weaknesses=["Testing"],
+                        detailed_analysis="The candidate answered clearly and with relevant examples. " * 8,
+                        recommendations="Proceed to the technical round.", created_at=now)
+        for i in range(n)
+    ]
+
+def default_path(model, rows) -> bytes:
+    field = create_response_field(name="Response", type_=List[model])
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+def time_it(fn, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    scale = 1000 / args.rows
+    print(f"orjson: {'yes' if responses.orjson else 'no'}, brotli: {'yes' if responses.brotli else 'no'}")
+    print(f"{'payload':<12}{'path':<28}{'ms / 1k rows':>14}{'bytes':>10}")
+
+    for label, model, adapter, rows in (
+        ("candidates", CandidateResponse, candidate_list_adapter, make_candidates(args.rows)),
+        ("reports", ReportResponse, report_list_adapter, make_reports(args.rows)),
+    ):
+        default_body = default_path(model, rows)
+        fast_body = responses.serialize(adapter, rows)
+        assert json.loads(default_body) == json.loads(fast_body)
+
+        results = [
+            ("response_model + json", lambda: default_path(model, rows), len(default_body)),
+            ("precomputed adapter", lambda: responses.serialize(adapter, rows), len(fast_body)),
+        ]
+        if responses.orjson is not None:
+            results.append((
+                "adapter + orjson",
+                lambda: responses.orjson.dumps(adapter.dump_python(adapter.validate_python(rows, from_attributes=True))),
+                len(fast_body),
+            ))
+        for encoding in ("gzip", "br"):
+            body, applied = responses.compress_body(fast_body, encoding)
+            if applied:
+                results.append((
+                    f"adapter + {applied}",
+                    lambda e=encoding: responses.compress_body(responses.serialize(adapter, rows), e),
+                    len(body),
+                ))
+
+        for name, fn, size in results:
+            print(f"{label:<12}{name:<28}{time_it(fn, args.repeat) * 1000 * scale:>14.2f}{size:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Rebuild the report_tags table from the strengths and weaknesses of current
+reports. New reports are tagged on insert; run this once after upgrading an
+existing database, or to repair the tags.
+
+Usage:
+    python scripts/rebuild_report_tags.py [--batch-size 1000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, init_db
+from app.services.tags import TagService
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        count = TagService(db).rebuild(batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Tagged current reports with {count} report tags")
+
+if __name__ == "__main__":
+    main()
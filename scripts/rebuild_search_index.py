@@ -0,0 +1,34 @@
+"""
+Rebuild the full-text search index from the candidates, interview_responses and
+reports tables. New rows are indexed incrementally on insert; run this once after
+enabling search on an existing database, or to repair the index.
+
+Usage:
+    python scripts/rebuild_search_index.py [--batch-size 1000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, init_db
+from app.services.search import SearchService
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        counts = SearchService(db).rebuild(batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    for doc_type, count in counts.items():
+        print(f"Indexed {count} {doc_type} documents")
+
+if __name__ == "__main__":
+    main()
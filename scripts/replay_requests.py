@@ -0,0 +1,72 @@
+"""
+Replay webhook requests recorded with REQUEST_RECORDING_ENABLED=true against
+the app, with Groq and Twilio replaced by local fakes, and profile each
+endpoint. The replay runs on a scratch SQLite database by default, with
+placeholder interviews created for the ids in the recording.
+
+Output, one file per endpoint in --output-dir:
+    cprofile: <endpoint>.prof, for pstats, snakeviz or `flameprof`
+    sampling: <endpoint>.folded, folded stacks for flamegraph.pl or speedscope
+plus summary.json comparing recorded and replayed latencies.
+
+Usage:
+    python scripts/replay_requests.py recordings/webhooks.jsonl [--profiler cprofile|sampling]
+        [--output-dir profiles] [--call-sid CA...] [--llm-latency 0.5]
+        [--sample-interval 0.005] [--database-url sqlite:///./replay.db]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording")
+    parser.add_argument("--profiler", choices=("cprofile", "sampling"), default="cprofile")
+    parser.add_argument("--output-dir", default="profiles")
+    parser.add_argument("--call-sid", help="replay only this call's requests")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds each fake Groq completion takes")
+    parser.add_argument("--sample-interval", type=float, default=0.005)
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file in the output directory")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        db_path = os.path.join(os.path.abspath(args.output_dir), "replay.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        database_url = f"sqlite:///{db_path}"
+    # Settings are read at import time, so configure them before importing the app
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_REPLICA_URL"] = ""
+    os.environ["REQUEST_RECORDING_ENABLED"] = "false"
+
+    from app.services.replay import Replayer, install_fakes, load_recording, seed_interviews
+    install_fakes(args.llm_latency)
+    from app.main import app
+    from app.db.database import SessionLocal
+
+    entries = load_recording(args.recording, call_sid=args.call_sid)
+    if not entries:
+        print("No recorded requests to replay")
+        return
+
+    db = SessionLocal()
+    try:
+        created = seed_interviews(db, entries)
+    finally:
+        db.close()
+    print(f"Replaying {len(entries)} requests ({created} placeholder interviews) with {args.profiler}")
+
+    summary = asyncio.run(Replayer(app, entries, args.profiler, args.output_dir, args.sample_interval).run())
+    for label, stats in summary["endpoints"].items():
+        print(f"{label}: {stats['count']} requests, replayed {json.dumps(stats['replayed'])}, recorded {json.dumps(stats['recorded'])}")
+    print(f"Wrote {len(summary['files'])} profiles to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Regenerate reports of completed interviews from their stored transcripts, e.g.
+after a change to the scoring prompt. Each interview gets a new report version;
+older versions stay in the reports table but endpoints serve the newest one.
+
+Progress is checkpointed after every batch. Rerunning with the same checkpoint
+file resumes where a crashed run stopped and retries interviews that failed.
+
+Usage:
+    python scripts/rescore_reports.py [--checkpoint rescore_checkpoint.json]
+        [--concurrency 4] [--requests-per-minute 30] [--batch-size 50] [--restart]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.database import SessionLocal, init_db
+from app.services.rescore import Checkpoint, ReportRescorer
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", default="rescore_checkpoint.json")
+    parser.add_argument("--concurrency", type=int, default=settings.RESCORE_CONCURRENCY)
+    parser.add_argument("--requests-per-minute", type=int, default=settings.RESCORE_REQUESTS_PER_MINUTE)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start a new run")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint)
+    if not args.restart and checkpoint.load():
+        print(
+            f"Resuming run started {checkpoint.started_at.isoformat()} "
+            f"after interview {checkpoint.last_interview_id} ({len(checkpoint.failed)} to retry)"
+        )
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rescorer = ReportRescorer(
+            db,
+            checkpoint,
+            concurrency=args.concurrency,
+            requests_per_minute=args.requests_per_minute,
+            batch_size=args.batch_size
+        )
+        counts = asyncio.run(rescorer.run())
+    finally:
+        db.close()
+
+    print(
+        f"Re-scored {counts['rescored']} interviews "
+        f"({counts['failed']} failed, {counts['skipped']} already done)"
+    )
+
+if __name__ == "__main__":
+    main()
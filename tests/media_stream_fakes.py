@@ -0,0 +1,95 @@
+"""
+Test stand-ins for exercising the streaming interview engine without Twilio
+or a speech provider: a scripted speech backend and a client that speaks the
+Twilio Media Streams protocol over any websocket with send_text/receive_text
+(e.g. starlette's TestClient.websocket_connect).
+"""
+from app.services.media_stream import SAMPLE_RATE, SpeechBackend, pcm16_to_mulaw
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+import numpy as np
+
+FRAME_SAMPLES = SAMPLE_RATE // 50  # Twilio sends 20 ms frames
+
+class ScriptedSpeechBackend(SpeechBackend):
+    """
+    Returns queued transcripts in order and synthesizes silence sized to the text
+    """
+    def __init__(self, transcripts: Optional[List[str]] = None):
+        self.transcripts = list(transcripts or [])
+        self.spoken: List[str] = []
+
+    async def transcribe(self, pcm16: bytes, sample_rate: int) -> str:
+        return self.transcripts.pop(0) if self.transcripts else ""
+
+    async def synthesize(self, text: str) -> bytes:
+        self.spoken.append(text)
+        return b"\xff" * (SAMPLE_RATE // 20 * max(1, len(text.split())))
+
+class FakeMediaStreamClient:
+    """
+    Plays the Twilio side of a bidirectional media stream
+    """
+    def __init__(self, websocket, stream_sid: str = "MZfake", call_sid: str = "CAfake"):
+        self.websocket = websocket
+        self.stream_sid = stream_sid
+        self.call_sid = call_sid
+        self.sequence = 0
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.sequence += 1
+        message.setdefault("sequenceNumber", str(self.sequence))
+        self.websocket.send_text(json.dumps(message))
+
+    def start(self, custom_parameters: Optional[Dict[str, str]] = None) -> None:
+        self._send({"event": "connected", "protocol": "Call", "version": "1.0.0"})
+        self._send({
+            "event": "start",
+            "streamSid": self.stream_sid,
+            "start": {
+                "streamSid": self.stream_sid,
+                "callSid": self.call_sid,
+                "tracks": ["inbound"],
+                "customParameters": custom_parameters or {},
+                "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": SAMPLE_RATE, "channels": 1}
+            }
+        })
+
+    def send_audio(self, samples: np.ndarray) -> None:
+        for offset in range(0, len(samples), FRAME_SAMPLES):
+            payload = pcm16_to_mulaw(samples[offset:offset + FRAME_SAMPLES])
+            self._send({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"track": "inbound", "payload": base64.b64encode(payload).decode()}
+            })
+
+    def speak(self, seconds: float, trailing_silence: float = 1.0) -> None:
+        """
+        Send a tone standing in for speech, then silence so the turn ends
+        """
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        self.send_audio((np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16))
+        self.silence(trailing_silence)
+
+    def silence(self, seconds: float) -> None:
+        self.send_audio(np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16))
+
+    def await_prompt(self) -> Tuple[str, int]:
+        """
+        Read outbound audio until the next mark, echo the mark as Twilio does once
+        playback finishes, and return (mark name, audio bytes received)
+        """
+        audio_bytes = 0
+        while True:
+            message = json.loads(self.websocket.receive_text())
+            if message["event"] == "media":
+                audio_bytes += len(base64.b64decode(message["media"]["payload"]))
+            elif message["event"] == "mark":
+                name = message["mark"]["name"]
+                self._send({"event": "mark", "streamSid": self.stream_sid, "mark": {"name": name}})
+                return name, audio_bytes
+
+    def stop(self) -> None:
+        self._send({"event": "stop", "streamSid": self.stream_sid, "stop": {"callSid": self.call_sid}})
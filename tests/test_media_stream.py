@@ -0,0 +1,148 @@
+"""
+Streaming interview sessions driven end to end over the media-stream websocket
+with the scripted speech backend and fake Twilio client
+"""
+import os
+import tempfile
+
+# Always a throwaway database, never whatever DATABASE_URL the shell exports
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from datetime import datetime
+from fastapi.testclient import TestClient
+import pytest
+
+import app.api.endpoints.interviews as interviews_endpoint
+from app.db.database import SessionLocal
+from app.db.models import Candidate, Interview, InterviewResponse, Report
+from app.main import app
+from app.services.groq_service import GroqService
+from app.services.jobs import JobService
+from tests.media_stream_fakes import FakeMediaStreamClient, ScriptedSpeechBackend
+
+QUESTIONS = [
+    {"question": f"Question about topic {i}?", "criteria": "Clear answer", "skill": "general", "difficulty": 2}
+    for i in range(3)
+]
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = {"questions": QUESTIONS, "generated": 0, "reports": 0}
+
+    async def generate_interview_questions(self, job_description, num_questions=5):
+        calls["generated"] += 1
+        return calls["questions"]
+
+    async def generate_final_report(self, interview_data):
+        calls["reports"] += 1
+        return {
+            "overall_score": 72,
+            "strengths": ["Communication"],
+            "weaknesses": ["Testing"],
+            "detailed_analysis": "Solid answers",
+            "recommendations": "Proceed"
+        }
+
+    monkeypatch.setattr(GroqService, "generate_interview_questions", generate_interview_questions)
+    monkeypatch.setattr(GroqService, "generate_final_report", generate_final_report)
+    return calls
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = ScriptedSpeechBackend(["First answer", "Second answer", "Third answer"])
+    monkeypatch.setattr(interviews_endpoint, "load_speech_backend", lambda: backend)
+    return backend
+
+@pytest.fixture
+def interview_id():
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Ada", email=f"ada-{datetime.utcnow().timestamp()}@example.com", phone="+15550000000")
+        db.add(candidate)
+        db.flush()
+        # A fresh description per test so no stored question set is reused
+        job = JobService(db).get_or_create(f"Streaming backend engineer {datetime.utcnow().timestamp()}")
+        interview = Interview(
+            candidate_id=candidate.id,
+            job_id=job.id,
+            status="in_progress",
+            scheduled_at=datetime.utcnow(),
+            started_at=datetime.utcnow()
+        )
+        db.add(interview)
+        db.commit()
+        return interview.id
+    finally:
+        db.close()
+
+def run_call(interview_id, answers):
+    """
+    Answer every question asked and return the marks received, in order
+    """
+    marks = []
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interviews/{interview_id}/media-stream") as websocket:
+            twilio = FakeMediaStreamClient(websocket)
+            twilio.start()
+            while True:
+                mark, audio_bytes = twilio.await_prompt()
+                assert audio_bytes > 0
+                marks.append(mark)
+                if mark == "goodbye" or len(marks) > answers + 1:
+                    break
+                twilio.speak(0.5)
+    return marks
+
+def interview_state(interview_id):
+    db = SessionLocal()
+    try:
+        status = db.query(Interview.status).filter(Interview.id == interview_id).scalar()
+        responses = [
+            (r.question_index, r.response) for r in db.query(InterviewResponse).filter(
+                InterviewResponse.interview_id == interview_id
+            ).order_by(InterviewResponse.question_index)
+        ]
+        reports = db.query(Report).filter(Report.interview_id == interview_id).all()
+        return status, responses, [r.overall_score for r in reports]
+    finally:
+        db.close()
+
+def test_full_session(llm, backend, interview_id):
+    marks = run_call(interview_id, answers=3)
+
+    assert marks == ["question-0", "question-1", "question-2", "goodbye"]
+    status, responses, scores = interview_state(interview_id)
+    assert status == "completed"
+    assert responses == [(0, "First answer"), (1, "Second answer"), (2, "Third answer")]
+    assert scores == [72]
+    assert backend.spoken[0].startswith("Hello Ada")
+    assert "interview is now complete" in backend.spoken[-1]
+
+def test_resume_after_dropped_call(llm, backend, interview_id):
+    db = SessionLocal()
+    db.add(InterviewResponse(interview_id=interview_id, question_index=0, question=QUESTIONS[0]["question"], response="Earlier answer"))
+    db.commit()
+    db.close()
+
+    marks = run_call(interview_id, answers=2)
+
+    assert marks == ["question-1", "question-2", "goodbye"]
+    assert backend.spoken[0].startswith("Welcome back Ada")
+    status, responses, scores = interview_state(interview_id)
+    assert status == "completed"
+    assert responses == [(0, "Earlier answer"), (1, "First answer"), (2, "Second answer")]
+    assert llm["reports"] == 1
+
+def test_failed_question_generation_does_not_complete(llm, backend, interview_id):
+    llm["questions"] = []
+
+    marks = run_call(interview_id, answers=0)
+
+    assert marks == ["goodbye"]
+    assert backend.spoken == ["Sorry, an application error occurred. Please try again later."]
+    status, responses, scores = interview_state(interview_id)
+    assert status == "in_progress"
+    assert responses == []
+    assert scores == []
+    assert llm["reports"] == 0